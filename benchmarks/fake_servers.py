@@ -0,0 +1,165 @@
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+import time
+
+from aiohttp import web
+
+from scraper.page_archive import INDEX_FILE, KIND_RESULTS, PageArchive
+
+PAGE_SIZE = 10  # scrape_indeed_jobs advances `start` by 10 per page
+
+TITLES = ["Retail Assistant", "Barista", "Warehouse Operative", "Care Assistant",
+          "Kitchen Porter", "Cleaner", "Receptionist", "Delivery Driver"]
+COMPANIES = ["Tesco", "Costa Coffee", "Amazon", "Bupa", "Greggs", "Aldi", "Boots", "Evri"]
+PLACES = ["Leigh WN7", "Atherton M46", "Tyldesley M29", "Wigan WN1", "Golborne WA3"]
+SALARIES = ["£11.44 an hour", "£10.50 - £12.00 an hour", "Up to £23,000 a year", "From £400 a week", ""]
+
+
+def synthetic_card(n: int) -> str:
+    """One Indeed-like result card; deterministic for a given index."""
+    salary = SALARIES[n % len(SALARIES)]
+    salary_html = f'<div class="salary-snippet">{salary}</div>' if salary else ""
+    return (
+        f'<div class="job_seen_beacon" data-jk="{n:016x}">'
+        f'<h2 class="jobTitle">{TITLES[n % len(TITLES)]}</h2>'
+        f'<span class="companyName">{COMPANIES[n % len(COMPANIES)]}</span>'
+        f'<div class="companyLocation">{PLACES[n % len(PLACES)]}</div>'
+        f'{salary_html}</div>'
+    )
+
+
+def synthetic_page(start: int, total: int) -> str:
+    cards = "".join(synthetic_card(n) for n in range(start, min(start + PAGE_SIZE, total)))
+    return f"<html><body><div id=\"mosaic-jobcards\">{cards}</div></body></html>"
+
+
+class FakeIndeed:
+    """
+    Serves Indeed-like result pages on /jobs.
+
+    Pages are synthetic by default; pass `pages_dir` to replay recorded pages
+    instead (served round-robin), either a directory of .html files or a
+    scraper page archive. `latency` delays every response and
+    `rate_429` is the fraction of requests answered with 429 Too Many Requests.
+    """
+
+    def __init__(self, total_jobs: int, latency: float = 0.0, rate_429: float = 0.0,
+                 pages_dir: str = None, seed: int = 0):
+        self.total_jobs = total_jobs
+        self.latency = latency
+        self.rate_429 = rate_429
+        self.recorded = self._load_pages(pages_dir) if pages_dir else None
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.throttled = 0
+
+    @staticmethod
+    def _load_pages(pages_dir):
+        if os.path.exists(os.path.join(pages_dir, INDEX_FILE)):
+            with PageArchive(pages_dir) as archive:
+                pages = [page.html for page in archive.pages(kind=KIND_RESULTS)]
+            if not pages:
+                raise ValueError(f"No result pages in archive {pages_dir}")
+            return pages
+        names = sorted(f for f in os.listdir(pages_dir) if f.endswith(".html"))
+        if not names:
+            raise ValueError(f"No .html pages found in {pages_dir}")
+        pages = []
+        for name in names:
+            with open(os.path.join(pages_dir, name), "r", encoding="utf-8") as f:
+                pages.append(f.read())
+        return pages
+
+    async def handle_jobs(self, request):
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.rate_429 and self.rng.random() < self.rate_429:
+            self.throttled += 1
+            return web.Response(status=429, headers={"Retry-After": "0"})
+
+        start = int(request.query.get("start", 0))
+        if start >= self.total_jobs:
+            html = synthetic_page(start, start)
+        elif self.recorded:
+            html = self.recorded[(start // PAGE_SIZE) % len(self.recorded)]
+        else:
+            html = synthetic_page(start, self.total_jobs)
+        return web.Response(text=html, content_type="text/html")
+
+    def app(self):
+        app = web.Application()
+        app.router.add_get("/jobs", self.handle_jobs)
+        return app
+
+
+class FakeBotAPI:
+    """
+    Minimal stand-in for the Telegram Bot API, enough for python-telegram-bot's
+    getMe / sendMessage / answerCallbackQuery / editMessageText calls.
+    Every sent message is kept in `sent` for inspection.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.sent = []
+        self._message_ids = itertools.count(1)
+
+    async def _params(self, request):
+        if request.content_type == "application/json":
+            return await request.json()
+        data = await request.post()
+        return {k: v for k, v in data.items()}
+
+    def _message(self, params):
+        chat_id = params.get("chat_id", 0)
+        return {
+            "message_id": next(self._message_ids),
+            "date": int(time.time()),
+            "chat": {"id": int(chat_id), "type": "private"},
+            "text": params.get("text", ""),
+        }
+
+    async def handle_method(self, request):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        method = request.match_info["method"]
+        params = await self._params(request)
+
+        if method == "getMe":
+            result = {"id": 1, "is_bot": True, "first_name": "FakeBot", "username": "fake_bot"}
+        elif method == "sendMessage":
+            if isinstance(params.get("reply_markup"), str):
+                params["reply_markup"] = json.loads(params["reply_markup"])
+            self.sent.append(params)
+            result = self._message(params)
+        elif method == "editMessageText":
+            result = self._message(params)
+        elif method in ("answerCallbackQuery", "deleteWebhook", "setMyCommands"):
+            result = True
+        elif method == "getUpdates":
+            result = []
+        else:
+            logging.warning(f"[FakeBotAPI] Unhandled method {method}")
+            return web.json_response({"ok": False, "error_code": 404, "description": "Not Found"}, status=404)
+        return web.json_response({"ok": True, "result": result})
+
+    def app(self):
+        app = web.Application()
+        app.router.add_post("/{token}/{method}", self.handle_method)
+        app.router.add_get("/{token}/{method}", self.handle_method)
+        return app
+
+
+async def start_server(app, host: str = "127.0.0.1"):
+    """Run an aiohttp app on a free local port; returns (runner, base_url)."""
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{port}"
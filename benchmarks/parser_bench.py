@@ -0,0 +1,75 @@
+"""
+Parser throughput benchmark over a scraper page archive.
+
+Replays archived result pages through parse_results_page, so selector changes
+can be timed against real captured HTML without fetching anything. With no
+--archive, a synthetic archive is built in a temporary directory first.
+
+    python -m benchmarks.parser_bench --archive page_archive --workers 1 4
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+from benchmarks.fake_servers import PAGE_SIZE, synthetic_page  # noqa: E402
+from scraper.indeed_scraper import replay_archive  # noqa: E402
+from scraper.page_archive import KIND_RESULTS, PageArchive  # noqa: E402
+
+
+def build_synthetic_archive(path, n_jobs):
+    with PageArchive(path) as archive:
+        for start in range(0, n_jobs, PAGE_SIZE):
+            archive.append(f"https://uk.indeed.com/jobs?start={start}",
+                           synthetic_page(start, n_jobs), kind=KIND_RESULTS)
+
+
+def bench(archive_dir, workers, repeat):
+    with PageArchive(archive_dir) as archive:
+        n_pages = sum(1 for _ in archive.pages(kind=KIND_RESULTS))
+        archive_bytes = os.path.getsize(archive.data_path)
+
+    results = []
+    for n_workers in workers:
+        durations = []
+        n_jobs = 0
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            n_jobs = len(replay_archive(archive_dir, workers=n_workers))
+            durations.append(time.perf_counter() - t0)
+        best = min(durations)
+        results.append({
+            "workers": n_workers,
+            "pages": n_pages,
+            "jobs": n_jobs,
+            "best_s": best,
+            "pages_per_s": n_pages / best if best else None,
+        })
+    return {"archive_bytes": archive_bytes, "results": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parser replay benchmark")
+    parser.add_argument("--archive", help="page archive directory (default: synthetic)")
+    parser.add_argument("--synthetic-jobs", type=int, default=10000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.archive:
+        report = bench(args.archive, args.workers, args.repeat)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            build_synthetic_archive(tmp, args.synthetic_jobs)
+            report = bench(tmp, args.workers, args.repeat)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
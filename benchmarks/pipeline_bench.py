@@ -0,0 +1,227 @@
+"""
+Offline end-to-end benchmark of the scrape → save → filter → dispatch pipeline.
+
+Runs against local stand-ins for Indeed and the Telegram Bot API (see
+fake_servers.py), so nothing touches the live sites. `filter` times the
+HF ranking pass for the seeded profiles (--profiles) and `dispatch`
+counts the messages actually sent. Each scale runs in its
+own process so peak RSS is per-scale. Results are printed (or written) as JSON.
+
+    python -m benchmarks.pipeline_bench --scales 33 1000 50000 --output bench.json
+    python -m benchmarks.pipeline_bench --baseline bench.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+from benchmarks.fake_servers import FakeBotAPI, FakeIndeed, start_server  # noqa: E402
+
+DEFAULT_SCALES = [33, 1000, 50000]
+STAGES = ["scrape", "save", "filter", "dispatch"]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile; fine for the handful of samples we collect."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def peak_rss_kb() -> int:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+BENCH_CV = ("Friendly, reliable retail and hospitality worker with till, stock and customer "
+            "service experience, looking for part-time weekend shifts around Leigh.")
+
+
+async def _run_once(n_jobs, indeed_url, bot_url, bot_api, matcher, n_profiles, archive):
+    import utils
+    from filters import salary_floor
+    from scraper.indeed_scraper import scrape_indeed_jobs
+    from telegram_bot import TelegramBot
+
+    timings = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        utils.DB_PATH = os.path.join(tmp, "jobs.db")
+        await utils.init_db()
+        if n_profiles:
+            cv_embedding = matcher.embed([BENCH_CV])[0]
+            for chat_id in range(1, n_profiles + 1):
+                await utils.save_profile(chat_id, cv_text=BENCH_CV, cv_embedding=cv_embedding)
+
+        t0 = time.perf_counter()
+        jobs = await scrape_indeed_jobs(limit=n_jobs, base_url=f"{indeed_url}/jobs",
+                                        archive_dir=os.path.join(tmp, "archive") if archive else None)
+        timings["scrape"] = (time.perf_counter() - t0, len(jobs))
+
+        t0 = time.perf_counter()
+        await utils.save_jobs(jobs)
+        timings["save"] = (time.perf_counter() - t0, len(jobs))
+
+        bot = TelegramBot(base_url=f"{bot_url}/bot")
+        # Share one loaded model across runs so model start-up isn't timed
+        bot._matcher = matcher
+        await bot.bot_app.initialize()
+        try:
+            # The ranking dispatch runs: embed new jobs, score jobs x CVs, mask, pick top-k
+            t0 = time.perf_counter()
+            profiles = await bot._dispatch_profiles()
+            loaded = await utils.load_jobs_from_db(*salary_floor(profiles))
+            await bot._rank_for_profiles(loaded, profiles)
+            timings["filter"] = (time.perf_counter() - t0, len(loaded))
+
+            sent_before = len(bot_api.sent)
+            t0 = time.perf_counter()
+            await bot.send_jobs_to_chat()
+            timings["dispatch"] = (time.perf_counter() - t0, len(bot_api.sent) - sent_before)
+        finally:
+            await bot.bot_app.shutdown()
+    return timings
+
+
+async def run_scale(n_jobs, repeat, indeed_latency, rate_429, bot_latency, pages_dir, n_profiles,
+                    archive=False):
+    from hf_ranker import HFMatcher
+
+    matcher = HFMatcher()
+    indeed = FakeIndeed(n_jobs, latency=indeed_latency, rate_429=rate_429, pages_dir=pages_dir)
+    bot_api = FakeBotAPI(latency=bot_latency)
+    indeed_runner, indeed_url = await start_server(indeed.app())
+    bot_runner, bot_url = await start_server(bot_api.app())
+
+    samples = {stage: [] for stage in STAGES}
+    items = {stage: 0 for stage in STAGES}
+    try:
+        for _ in range(repeat):
+            timings = await _run_once(n_jobs, indeed_url, bot_url, bot_api, matcher, n_profiles, archive)
+            for stage, (elapsed, count) in timings.items():
+                samples[stage].append(elapsed)
+                items[stage] = count
+    finally:
+        await indeed_runner.cleanup()
+        await bot_runner.cleanup()
+
+    stages = {}
+    for stage in STAGES:
+        durations = samples[stage]
+        median = statistics.median(durations)
+        stages[stage] = {
+            "items": items[stage],
+            "p50_s": median,
+            "p99_s": percentile(durations, 99),
+            "throughput_per_s": items[stage] / median if median else None,
+        }
+
+    return {
+        "jobs": n_jobs,
+        "profiles": n_profiles,
+        "archive": archive,
+        "repeat": repeat,
+        "stages": stages,
+        "total_p50_s": sum(s["p50_s"] for s in stages.values()),
+        "indeed_requests": indeed.requests,
+        "indeed_429s": indeed.throttled,
+        "messages_sent": len(bot_api.sent),
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def _run_scale_process(n_jobs, opts):
+    logging.basicConfig(level=opts["log_level"])
+    return asyncio.run(run_scale(n_jobs, opts["repeat"], opts["indeed_latency"],
+                                 opts["rate_429"], opts["bot_latency"], opts["pages_dir"],
+                                 opts["profiles"], opts["archive"]))
+
+
+def compare(current, baseline):
+    """Attach percentage change of p50 latency vs a previous run's JSON."""
+    base_by_scale = {str(r["jobs"]): r for r in baseline.get("results", [])}
+    for result in current["results"]:
+        base = base_by_scale.get(str(result["jobs"]))
+        if not base:
+            continue
+        for stage, stats in result["stages"].items():
+            base_p50 = base["stages"].get(stage, {}).get("p50_s")
+            if base_p50:
+                stats["p50_change_pct"] = round((stats["p50_s"] - base_p50) / base_p50 * 100, 2)
+        if base.get("peak_rss_kb"):
+            result["peak_rss_change_pct"] = round(
+                (result["peak_rss_kb"] - base["peak_rss_kb"]) / base["peak_rss_kb"] * 100, 2)
+    return current
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmark")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--indeed-latency", type=float, default=0.0, help="seconds per Indeed page")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fraction of Indeed requests throttled")
+    parser.add_argument("--bot-latency", type=float, default=0.0, help="seconds per Bot API call")
+    parser.add_argument("--pages-dir", help="recorded Indeed pages to replay (.html directory or page archive)")
+    parser.add_argument("--profiles", type=int, default=1,
+                        help="chat profiles to seed; 0 benchmarks the single-chat TELEGRAM_CHAT_ID path")
+    parser.add_argument("--archive", action="store_true",
+                        help="archive fetched pages during scrape (off in production unless PAGE_ARCHIVE_DIR is set)")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    parser.add_argument("--baseline", help="previous JSON output to compare against")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args(argv)
+
+    opts = {
+        "repeat": args.repeat,
+        "indeed_latency": args.indeed_latency,
+        "rate_429": args.rate_429,
+        "bot_latency": args.bot_latency,
+        "pages_dir": args.pages_dir,
+        "profiles": args.profiles,
+        "archive": args.archive,
+        "log_level": args.log_level,
+    }
+
+    results = []
+    ctx = multiprocessing.get_context("spawn")
+    for n_jobs in args.scales:
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            results.append(pool.submit(_run_scale_process, n_jobs, opts).result())
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": opts,
+        "results": results,
+    }
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            report = compare(report, json.load(f))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import base64
+import hashlib
+import hmac
+import time
+from typing import NamedTuple, Optional
+
+# Telegram rejects callback_data longer than 64 bytes
+MAX_CALLBACK_BYTES = 64
+VERSION = "1"
+SIGNATURE_BYTES = 8
+
+ACTIONS = {"accept": "a", "decline": "d", "more": "m"}
+_ACTION_NAMES = {v: k for k, v in ACTIONS.items()}
+
+
+class Callback(NamedTuple):
+    action: str
+    value: str
+
+
+class CallbackCodec:
+    """
+    Compact, versioned, signed inline-button payloads:
+
+        1a0123456789abcdef.Xk3v9QmZt2A
+
+    version, action letter, job id (or page number), then a truncated
+    HMAC-SHA256 over all of that plus the chat id, so a button can't be
+    forged or replayed in another chat. Buttons sent before this format
+    ("accept_<id>") are unsigned and anyone can craft them, so they only
+    decode when `legacy_until` (a unix timestamp) is set and still ahead.
+    """
+
+    def __init__(self, secret: str, legacy_until: Optional[float] = None):
+        self._key = hashlib.sha256(f"callback:{secret}".encode("utf-8")).digest()
+        self.legacy_until = legacy_until
+
+    def _sign(self, body: str, chat_id) -> str:
+        mac = hmac.new(self._key, f"{body}|{chat_id}".encode("utf-8"), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(mac[:SIGNATURE_BYTES]).rstrip(b"=").decode("ascii")
+
+    def encode(self, action: str, value, chat_id) -> str:
+        body = f"{VERSION}{ACTIONS[action]}{value}"
+        data = f"{body}.{self._sign(body, chat_id)}"
+        if len(data.encode("utf-8")) > MAX_CALLBACK_BYTES:
+            raise ValueError(f"Callback data for {action} {value} exceeds {MAX_CALLBACK_BYTES} bytes")
+        return data
+
+    def decode(self, data: str, chat_id) -> Optional[Callback]:
+        """The decoded callback, or None if it is malformed or the signature doesn't match."""
+        if data.startswith(VERSION) and "." in data:
+            body, _, signature = data.rpartition(".")
+            if len(body) < 3 or body[1] not in _ACTION_NAMES:
+                return None
+            if not hmac.compare_digest(signature, self._sign(body, chat_id)):
+                return None
+            return Callback(_ACTION_NAMES[body[1]], body[2:])
+
+        # Legacy "<action>_<value>" buttons from before versioning, during the grace period only
+        if self.legacy_until is None or time.time() >= self.legacy_until:
+            return None
+        action, sep, value = data.partition("_")
+        if sep and action in ACTIONS and value:
+            return Callback(action, value)
+        return None
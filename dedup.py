@@ -0,0 +1,220 @@
+import hashlib
+import logging
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from salary import parse_salary
+
+# 128 permutations split into 16 bands of 8 rows: pairs above ~0.7 Jaccard
+# almost always share a bucket, pairs below ~0.4 almost never do.
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+DUPLICATE_THRESHOLD = 0.8
+DESCRIPTION_SHINGLE = 3
+# Extra lsh_buckets band keyed on title + town, so reposts that differ in
+# company or location detail (which MinHash over a few tokens misses) still
+# meet as candidates for short_duplicate()
+TITLE_BAND = BANDS
+# Bump whenever shingles(), the hashing or the bucket keys change; stored signatures are rebuilt
+SIGNATURE_VERSION = 3
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+# Fixed seed: signatures are persisted, so the permutations must never change.
+# 32-bit coefficients keep a * x (x is a crc32) below 2**64 in uint64.
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+_NON_WORD = re.compile(r"[^a-z0-9£]+")
+
+
+def normalize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return _NON_WORD.sub(" ", text.lower()).split()
+
+
+def shingles(job: Dict) -> set:
+    """Field-tagged word shingles: single tokens for the short fields, 3-grams for the description."""
+    out = set()
+    for field in ("title", "company", "location", "salary"):
+        out.update(f"{field[0]}:{tok}" for tok in normalize(job.get(field)))
+    words = normalize(job.get("description"))
+    if len(words) < DESCRIPTION_SHINGLE:
+        out.update(f"d:{w}" for w in words)
+    else:
+        for i in range(len(words) - DESCRIPTION_SHINGLE + 1):
+            out.add("d:" + " ".join(words[i:i + DESCRIPTION_SHINGLE]))
+    return out
+
+
+def minhash(tokens: Iterable[str]) -> np.ndarray:
+    hashes = np.fromiter((zlib.crc32(t.encode("utf-8")) for t in tokens), dtype=np.uint64)
+    if not hashes.size:
+        return np.full(NUM_PERM, _MAX_HASH, dtype=np.uint32)
+    # (a * x + b) mod p for every (permutation, shingle) pair at once, reducing
+    # the product before adding b so the uint64 arithmetic can't wrap
+    permuted = (((np.outer(hashes, _PERM_A) % _MERSENNE_PRIME) + _PERM_B) % _MERSENNE_PRIME) & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def signature(job: Dict) -> np.ndarray:
+    return minhash(shingles(job))
+
+
+def band_keys(sig: np.ndarray) -> List[int]:
+    """One signed 64-bit bucket key per band, ready for an SQLite INTEGER column."""
+    keys = []
+    for band in range(BANDS):
+        chunk = sig[band * ROWS:(band + 1) * ROWS].tobytes()
+        keys.append(int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), "little", signed=True))
+    return keys
+
+
+def _key(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little", signed=True)
+
+
+def title_key(job: Dict) -> Optional[int]:
+    """Bucket key from the title words and the first location word ("Leigh WN7 1NX" -> "leigh")."""
+    title = sorted(set(normalize(job.get("title"))))
+    if not title:
+        return None
+    location = normalize(job.get("location"))
+    return _key(" ".join(title) + "|" + (location[0] if location else ""))
+
+
+def short_duplicate(a: Dict, b: Dict) -> bool:
+    """
+    Repost test for jobs without a description, which is all a results
+    page gives us: the same title words, one location contained in the
+    other ("Leigh WN7" / "Leigh WN7 1NX") and the same pay. The company may
+    differ, since agencies repost employers' vacancies, unless neither job
+    states pay, in which case it has to match too.
+    """
+    if not normalize(a.get("title")) or set(normalize(a.get("title"))) != set(normalize(b.get("title"))):
+        return False
+    loc_a, loc_b = set(normalize(a.get("location"))), set(normalize(b.get("location")))
+    if not (loc_a <= loc_b or loc_b <= loc_a):
+        return False
+    pay = parse_salary(a.get("salary"))
+    if pay != parse_salary(b.get("salary")):
+        return False
+    if pay == (None, None):
+        return set(normalize(a.get("company"))) == set(normalize(b.get("company")))
+    return True
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the two shingle sets."""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+def has_description(job: Dict) -> bool:
+    return len(normalize(job.get("description"))) >= DESCRIPTION_SHINGLE
+
+
+async def init_dedup_tables(db):
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS dedup_meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+    """)
+    cursor = await db.execute("SELECT value FROM dedup_meta WHERE key = 'signature_version'")
+    row = await cursor.fetchone()
+    stale = row is None or row[0] != SIGNATURE_VERSION
+    if stale:
+        await db.execute("DROP TABLE IF EXISTS job_minhash")
+        await db.execute("DROP TABLE IF EXISTS lsh_buckets")
+
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS job_minhash (
+            job_id TEXT PRIMARY KEY,
+            signature BLOB NOT NULL,
+            has_description INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS lsh_buckets (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            job_id TEXT NOT NULL,
+            PRIMARY KEY (band, bucket, job_id)
+        ) WITHOUT ROWID
+    """)
+    if stale:
+        await rebuild_duplicates(db)
+        await db.execute("INSERT OR REPLACE INTO dedup_meta (key, value) VALUES ('signature_version', ?)",
+                         (SIGNATURE_VERSION,))
+
+
+async def rebuild_duplicates(db):
+    """Re-index every stored job from scratch, in ingest order, after the signature scheme changed."""
+    await db.execute("UPDATE jobs SET duplicate_of = NULL WHERE duplicate_of IS NOT NULL")
+    cursor = await db.execute("""
+        SELECT id, title, company, location, salary, description
+        FROM jobs ORDER BY scraped_at, rowid
+    """)
+    columns = [c[0] for c in cursor.description]
+    jobs = [dict(zip(columns, row)) for row in await cursor.fetchall()]
+    duplicates = await assign_duplicates(db, jobs)
+    if jobs:
+        logging.info(f"[dedup] Rebuilt signatures for {len(jobs)} jobs, {len(duplicates)} duplicates")
+
+
+async def assign_duplicates(db, jobs: List[Dict]) -> Dict[str, str]:
+    """
+    Index newly ingested jobs and map each near-duplicate to its cluster
+    representative (the earliest-seen job of the cluster). Two jobs with
+    descriptions are duplicates at DUPLICATE_THRESHOLD MinHash similarity;
+    otherwise short_duplicate() decides. Jobs are indexed one by one, so
+    reposts within the same batch are caught too.
+    Returns {job_id: representative_id} for the duplicates only.
+    """
+    duplicates = {}
+    for job in jobs:
+        sig = signature(job)
+        buckets = list(enumerate(band_keys(sig)))
+        key = title_key(job)
+        if key is not None:
+            buckets.append((TITLE_BAND, key))
+        described = has_description(job)
+
+        placeholders = ",".join("(?, ?)" for _ in buckets)
+        params = [v for bucket in buckets for v in bucket]
+        cursor = await db.execute(f"""
+            SELECT m.job_id, m.signature, m.has_description, j.duplicate_of,
+                   j.title, j.company, j.location, j.salary
+            FROM job_minhash m JOIN jobs j ON j.id = m.job_id
+            WHERE m.job_id IN (
+                SELECT job_id FROM lsh_buckets WHERE (band, bucket) IN (VALUES {placeholders})
+            )
+        """, params)
+        best, best_sim = None, 0.0
+        for cand_id, cand_sig, cand_described, cand_root, *fields in await cursor.fetchall():
+            # A member pointing back at this id (e.g. a re-ingested representative)
+            if cand_id == job["id"] or (cand_root or cand_id) == job["id"]:
+                continue
+            sim = similarity(sig, np.frombuffer(cand_sig, dtype=np.uint32))
+            if described and cand_described:
+                duplicate = sim >= DUPLICATE_THRESHOLD
+            else:
+                duplicate = short_duplicate(job, dict(zip(("title", "company", "location", "salary"), fields)))
+            if duplicate and (best is None or sim > best_sim):
+                best, best_sim = cand_root or cand_id, sim
+
+        await db.execute("""
+            INSERT OR REPLACE INTO job_minhash (job_id, signature, has_description) VALUES (?, ?, ?)
+        """, (job["id"], sig.tobytes(), int(described)))
+        await db.executemany("INSERT OR IGNORE INTO lsh_buckets (band, bucket, job_id) VALUES (?, ?, ?)",
+                             [(band, key, job["id"]) for band, key in buckets])
+        if best:
+            await db.execute("UPDATE jobs SET duplicate_of = ? WHERE id = ?", (best, job["id"]))
+            duplicates[job["id"]] = best
+    return duplicates
@@ -1,6 +1,9 @@
 import math
 from typing import Optional, List, Dict
+
+import numpy as np
 from config import LEIGH_COORDINATES, config
+from preferences import preference_matrix
 
 # Constants pulled from config
 MAX_DISTANCE_MILES = config.LOCATION_RADIUS_MILES
@@ -82,3 +85,107 @@ async def filter_and_score_jobs(jobs: List[Dict]) -> List[Dict]:
     Currently just sorts jobs by 'score' field (descending) and returns top 8.
     """
     return sorted(jobs, key=lambda x: x.get("score", 0), reverse=True)[:8]
+
+
+def salary_floor(profiles: List[Dict]):
+    """
+    Loosest (hourly, yearly) thresholds across `profiles`, or the config
+    defaults with no profiles. Anything below both can be dropped in SQL
+    before the per-profile masks run.
+    """
+    if not profiles:
+        return MIN_SALARY_PER_HOUR, MIN_SALARY_PER_YEAR
+    hourly = min(MIN_SALARY_PER_HOUR if p.get("min_salary_hourly") is None else p["min_salary_hourly"]
+                 for p in profiles)
+    yearly = min(MIN_SALARY_PER_YEAR if p.get("min_salary_yearly") is None else p["min_salary_yearly"]
+                 for p in profiles)
+    return hourly, yearly
+
+
+def _column(jobs: List[Dict], key: str) -> np.ndarray:
+    return np.array([np.nan if job.get(key) is None else job[key] for job in jobs], dtype=np.float64)
+
+
+def _profile_column(profiles: List[Dict], key: str, default: float) -> np.ndarray:
+    return np.array([default if p.get(key) is None else p[key] for p in profiles], dtype=np.float64)
+
+
+def haversine_matrix(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """Vectorized haversine(); broadcasts like numpy arithmetic."""
+    R = 3958.8
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dphi = np.radians(lat2 - lat1)
+    dlambda = np.radians(lon2 - lon1)
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    return 2 * R * np.arcsin(np.sqrt(a))
+
+
+def profile_filter_masks(jobs: List[Dict], profiles: List[Dict], scores: np.ndarray) -> np.ndarray:
+    """
+    jobs×profiles boolean mask of which jobs each profile may be sent, using
+    the profile's own centre, radius and salary thresholds (falling back to
+    the config defaults). Missing job data does not exclude a job: no
+    coordinates passes the radius check, and no salary passes unless the
+    profile sets min_score_without_salary, which `scores` must then reach.
+    """
+    lat, lon = _column(jobs, "latitude")[:, None], _column(jobs, "longitude")[:, None]
+    center_lat = _profile_column(profiles, "center_lat", LEIGH_COORDINATES["lat"])[None, :]
+    center_lon = _profile_column(profiles, "center_lon", LEIGH_COORDINATES["lon"])[None, :]
+    radius = _profile_column(profiles, "radius_miles", MAX_DISTANCE_MILES)[None, :]
+    with np.errstate(invalid="ignore"):
+        distance = haversine_matrix(lat, lon, center_lat, center_lon)
+        radius_ok = np.isnan(distance) | (distance <= radius)
+
+        hourly, yearly = _column(jobs, "salary_hourly")[:, None], _column(jobs, "salary_yearly")[:, None]
+        min_hourly = _profile_column(profiles, "min_salary_hourly", MIN_SALARY_PER_HOUR)[None, :]
+        min_yearly = _profile_column(profiles, "min_salary_yearly", MIN_SALARY_PER_YEAR)[None, :]
+        min_score = _profile_column(profiles, "min_score_without_salary", np.nan)[None, :]
+        no_salary_ok = np.isnan(min_score) | (scores >= min_score)
+        salary_ok = np.where(~np.isnan(hourly), hourly >= min_hourly,
+                             np.where(~np.isnan(yearly), yearly >= min_yearly, no_salary_ok))
+
+        rating = _column(jobs, "company_rating")[:, None]
+        rating_ok = np.isnan(rating) | (rating >= MIN_COMPANY_RATING)
+
+    return radius_ok & salary_ok & rating_ok
+
+
+def rank_jobs_for_profiles(jobs: List[Dict], profiles: List[Dict], job_embeddings: np.ndarray,
+                           limit: int) -> Dict[str, List[Dict]]:
+    """
+    Score every job against every profile's CV in one matrix product, mask
+    by each profile's filters and return the top `limit` jobs per chat id.
+    Profiles with a learned preference model (see preferences.py) get their
+    CV scores nudged by it before the top jobs are picked. Jobs in a
+    profile's "declined_ids" are never returned for that profile.
+    """
+    from hf_ranker import HFMatcher
+
+    if not jobs or not profiles:
+        return {p["chat_id"]: [] for p in profiles}
+
+    dim = job_embeddings.shape[1]
+    cv_embeddings = np.stack([
+        p["cv_embedding"] if p.get("cv_embedding") is not None else np.zeros(dim, dtype=np.float32)
+        for p in profiles
+    ])
+    scores = HFMatcher.score_matrix(job_embeddings, cv_embeddings)
+    mask = profile_filter_masks(jobs, profiles, scores)
+    rows = {job["id"]: i for i, job in enumerate(jobs)}
+    for col, profile in enumerate(profiles):
+        declined = [rows[job_id] for job_id in profile.get("declined_ids", ()) if job_id in rows]
+        mask[declined, col] = False
+    scores = scores + preference_matrix(job_embeddings, [p.get("pref_weights") for p in profiles],
+                                        [p.get("pref_bias", 0.0) for p in profiles])
+    masked = np.where(mask, scores, -np.inf)
+
+    ranked = {}
+    k = min(limit, len(jobs))
+    for col, profile in enumerate(profiles):
+        column = masked[:, col]
+        top = np.argpartition(-column, k - 1)[:k] if k < len(jobs) else np.arange(len(jobs))
+        top = top[np.argsort(-column[top], kind="stable")]
+        ranked[profile["chat_id"]] = [
+            dict(jobs[i], score=float(column[i])) for i in top if np.isfinite(column[i])
+        ]
+    return ranked
@@ -1,6 +1,15 @@
 from sentence_transformers import SentenceTransformer, util
+from typing import Dict, List
+import numpy as np
 import os
 
+
+def job_text(job: Dict) -> str:
+    """The text a job is embedded from."""
+    parts = [job.get("title"), job.get("company"), job.get("location"), job.get("salary"), job.get("description")]
+    return " | ".join(p for p in parts if p)
+
+
 class HFMatcher:
     def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
         """
@@ -20,6 +29,24 @@ class HFMatcher:
         sim = util.pytorch_cos_sim(embeddings[0], embeddings[1])
         return float(sim.item())
 
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        L2-normalized float32 embeddings, one row per text, encoded in batches.
+        """
+        if not texts:
+            return np.zeros((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+        embeddings = self.model.encode(texts, batch_size=64, convert_to_numpy=True, normalize_embeddings=True)
+        return embeddings.astype(np.float32)
+
+    @staticmethod
+    def score_matrix(job_embeddings: np.ndarray, cv_embeddings: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity of every job against every CV as a jobs×CVs matrix.
+        Inputs are L2-normalized, so this is a single matrix product; an
+        extra CV only adds a column.
+        """
+        return job_embeddings @ cv_embeddings.T
+
     @staticmethod
     def example_usage():
         """
@@ -27,5 +54,6 @@ class HFMatcher:
         > matcher = HFMatcher()
         > score = matcher.score(cv_text, "Software engineer at Acme UK")
         > print(score)
+        > scores = matcher.score_matrix(matcher.embed(job_texts), matcher.embed(cv_texts))
         """
         pass
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from utils import record_feedback_batch
+
+CACHE_SIZE = 1024
+CACHE_TTL_SECONDS = 3 * 24 * 3600
+FLUSH_INTERVAL_SECONDS = 5.0
+MAX_PENDING = 100
+
+
+class JobCache:
+    """
+    In-process LRU of recently dispatched jobs with a TTL, so Accept/Decline
+    taps can echo the job without going back to SQLite.
+    """
+
+    def __init__(self, maxsize: int = CACHE_SIZE, ttl: float = CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+
+    def put(self, job: Dict):
+        self._items[job["id"]] = (time.monotonic() + self.ttl, job)
+        self._items.move_to_end(job["id"])
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        item = self._items.get(job_id)
+        if item is None:
+            return None
+        expires, job = item
+        if expires < time.monotonic():
+            del self._items[job_id]
+            return None
+        self._items.move_to_end(job_id)
+        return job
+
+    def __len__(self):
+        return len(self._items)
+
+
+class FeedbackWriter:
+    """
+    Write-behind queue for Accept/Decline feedback. Callbacks only append to
+    memory; the queue is written in one transaction FLUSH_INTERVAL_SECONDS
+    after the first pending item, as soon as MAX_PENDING items pile up, or
+    when flush() is awaited (before anything reads declined state). A
+    failed write keeps its items queued and is retried every
+    FLUSH_INTERVAL_SECONDS.
+    """
+
+    def __init__(self, interval: float = FLUSH_INTERVAL_SECONDS, max_pending: int = MAX_PENDING):
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending: List[Tuple[str, str, bool]] = []
+        self._timer: Optional[asyncio.Task] = None
+        # Keep references so running flushes aren't garbage collected
+        self._tasks = set()
+        self._lock = asyncio.Lock()
+
+    def add(self, chat_id, job_id: str, accepted: bool):
+        self._pending.append((str(chat_id), job_id, accepted))
+        if len(self._pending) >= self.max_pending:
+            self._spawn(0)
+        elif self._timer is None or self._timer.done():
+            self._timer = self._spawn(self.interval)
+
+    def _spawn(self, delay: float) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(self._flush_after(delay))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _flush_after(self, delay: float):
+        await asyncio.sleep(delay)
+        await self.try_flush()
+
+    def _retry_later(self):
+        # The running timer task may be the caller, and it isn't done yet
+        if self._timer is None or self._timer.done() or self._timer is asyncio.current_task():
+            self._timer = self._spawn(self.interval)
+
+    async def try_flush(self) -> bool:
+        """
+        flush() for paths that must carry on regardless (scheduled dispatch,
+        /test, /search): on failure, e.g. while maintenance holds the
+        database, log it, keep the items queued and schedule a retry.
+        """
+        try:
+            await self.flush()
+            return True
+        except Exception as e:
+            logging.exception(f"[feedback] Failed to write feedback batch, retrying later: {e}")
+            self._retry_later()
+            return False
+
+    async def flush(self):
+        async with self._lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return
+            try:
+                await record_feedback_batch(batch)
+            except BaseException:
+                # Keep the batch for the next attempt rather than losing taps
+                self._pending = batch + self._pending
+                raise
+        logging.info(f"[feedback] Wrote {len(batch)} feedback updates")
+
+    def __len__(self):
+        return len(self._pending)
@@ -0,0 +1,40 @@
+import math
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Online logistic regression over the stored (L2-normalized) job embeddings.
+# One SGD step per Accept/Decline, so an update costs O(embedding size).
+LEARNING_RATE = 0.5
+# How far a fully confident preference can move a job's CV similarity score
+PREFERENCE_WEIGHT = 0.3
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def update_preference(weights: Optional[np.ndarray], bias: float, job_embedding: np.ndarray,
+                      accepted: bool) -> Tuple[np.ndarray, float]:
+    """One SGD step of log-loss on a single accept (1) or decline (0) label."""
+    if weights is None:
+        weights = np.zeros_like(job_embedding, dtype=np.float32)
+    predicted = 1.0 / (1.0 + math.exp(-(float(weights @ job_embedding) + bias)))
+    error = (1.0 if accepted else 0.0) - predicted
+    weights = (weights + LEARNING_RATE * error * job_embedding).astype(np.float32)
+    return weights, bias + LEARNING_RATE * error
+
+
+def preference_matrix(job_embeddings: np.ndarray, weights: List[Optional[np.ndarray]],
+                      biases: List[float]) -> np.ndarray:
+    """
+    jobs×profiles score adjustment in [-PREFERENCE_WEIGHT, PREFERENCE_WEIGHT].
+    Profiles without feedback get 0. Like the CV scores this is a single
+    matrix product over embeddings that are already stored.
+    """
+    dim = job_embeddings.shape[1]
+    trained = np.array([w is not None for w in weights])
+    W = np.stack([w if w is not None else np.zeros(dim, dtype=np.float32) for w in weights])
+    b = np.array([bias or 0.0 for bias in biases], dtype=np.float32)
+    adjustment = (_sigmoid(job_embeddings @ W.T + b) - 0.5) * 2 * PREFERENCE_WEIGHT
+    return np.where(trained[None, :], adjustment, 0.0)
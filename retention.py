@@ -0,0 +1,186 @@
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+
+import aiosqlite
+import zstandard
+
+import utils
+from config import TELEGRAM_CHAT_ID, config
+
+# Policies, overridable from config
+JOB_RETENTION_DAYS = getattr(config, "JOB_RETENTION_DAYS", 30)
+DECLINED_RETENTION_DAYS = getattr(config, "DECLINED_RETENTION_DAYS", 3)
+ARCHIVE_BATCH_SIZE = 500
+# Pages handed back to the OS per maintenance run (4 KiB pages -> 16 MiB)
+VACUUM_PAGES_PER_RUN = 4096
+# Re-run a full ANALYZE once this share of the live rows has been archived
+ANALYZE_CHANGE_RATIO = 0.1
+
+_compressor = zstandard.ZstdCompressor(level=9)
+_decompressor = zstandard.ZstdDecompressor()
+
+
+def archive_db_path() -> str:
+    return os.path.join(os.path.dirname(utils.DB_PATH), "jobs_archive.db")
+
+
+async def _attach_archive(db):
+    await db.execute("ATTACH DATABASE ? AS archive", (archive_db_path(),))
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS archive.jobs_archive (
+            id TEXT PRIMARY KEY,
+            archived_at REAL NOT NULL,
+            reason TEXT NOT NULL,
+            data BLOB NOT NULL
+        )
+    """)
+
+
+async def _fetch_jobs(db, sql: str, params) -> List[Dict]:
+    cursor = await db.execute(sql, params)
+    columns = [c[0] for c in cursor.description]
+    return [dict(zip(columns, row)) for row in await cursor.fetchall()]
+
+
+async def archive_jobs(now: Optional[float] = None) -> Dict[str, int]:
+    """
+    Move jobs out of jobs.db into the compressed archive database:
+    declined jobs after DECLINED_RETENTION_DAYS, every job after
+    JOB_RETENTION_DAYS. Declines are per chat, so a job counts as declined
+    once every chat that receives jobs (the profiles plus the config chat)
+    declined it; declines from other chats, e.g. on /search results, don't
+    count. Each
+    row is stored as zstd-compressed JSON, its id is tombstoned in
+    archived_ids so save_jobs() won't re-add it, and its embedding, MinHash,
+    LSH and feedback entries are dropped with it (the search index follows
+    via triggers). Returns counts per reason.
+
+    Near-duplicates of an archived representative follow it when it was
+    declined; when it merely expired, the earliest remaining one becomes the
+    cluster's new representative.
+    """
+    now = time.time() if now is None else now
+    declined_cutoff = now - DECLINED_RETENTION_DAYS * 86400
+    age_cutoff = now - JOB_RETENTION_DAYS * 86400
+    counts = {"declined": 0, "expired": 0}
+
+    async with aiosqlite.connect(utils.DB_PATH) as db:
+        config_chat = str(TELEGRAM_CHAT_ID)
+        cursor = await db.execute("""
+            SELECT count(*) + NOT EXISTS (SELECT 1 FROM profiles WHERE chat_id = ?) FROM profiles
+        """, (config_chat,))
+        chats = (await cursor.fetchone())[0]
+        await _attach_archive(db)
+        while True:
+            jobs = await _fetch_jobs(db, """
+                SELECT * FROM (
+                    SELECT *, declined = 1 OR (
+                        SELECT count(DISTINCT f.chat_id) FROM job_feedback f
+                        WHERE f.job_id = jobs.id AND f.action = 'decline'
+                          AND (f.chat_id = ? OR f.chat_id IN (SELECT chat_id FROM profiles))
+                    ) >= ? AS declined_all
+                    FROM jobs
+                    WHERE scraped_at < ?
+                )
+                WHERE scraped_at < ? OR (declined_all AND scraped_at < ?)
+                LIMIT ?
+            """, (config_chat, chats, max(age_cutoff, declined_cutoff), age_cutoff, declined_cutoff,
+                  ARCHIVE_BATCH_SIZE))
+            if not jobs:
+                break
+
+            reasons = {job["id"]: "declined" if job.pop("declined_all") else "expired" for job in jobs}
+            declined_roots = [job_id for job_id, reason in reasons.items() if reason == "declined"]
+            for i in range(0, len(declined_roots), 900):
+                chunk = declined_roots[i:i + 900]
+                members = await _fetch_jobs(db, f"""
+                    SELECT * FROM jobs WHERE duplicate_of IN ({",".join("?" for _ in chunk)})
+                """, chunk)
+                for member in members:
+                    if member["id"] not in reasons:
+                        reasons[member["id"]] = "declined"
+                        jobs.append(member)
+
+            archived = []
+            for job in jobs:
+                counts[reasons[job["id"]]] += 1
+                archived.append((job["id"], now, reasons[job["id"]],
+                                 _compressor.compress(json.dumps(job).encode("utf-8"))))
+            ids = [(job["id"],) for job in jobs]
+
+            # One transaction per batch across both databases
+            await db.executemany("""
+                INSERT OR REPLACE INTO archive.jobs_archive (id, archived_at, reason, data)
+                VALUES (?, ?, ?, ?)
+            """, archived)
+            await db.executemany("INSERT OR IGNORE INTO archived_ids (id) VALUES (?)", ids)
+            await db.executemany("DELETE FROM lsh_buckets WHERE job_id = ?", ids)
+            await db.executemany("DELETE FROM job_minhash WHERE job_id = ?", ids)
+            await db.executemany("DELETE FROM job_embeddings WHERE job_id = ?", ids)
+            await db.executemany("DELETE FROM job_feedback WHERE job_id = ?", ids)
+            await db.executemany("DELETE FROM jobs WHERE id = ?", ids)
+            for job_id, reason in reasons.items():
+                if reason == "expired":
+                    await _promote_member(db, job_id)
+            await db.commit()
+        await db.execute("DETACH DATABASE archive")
+
+    if any(counts.values()):
+        logging.info(f"[retention] Archived {counts['declined']} declined and {counts['expired']} expired jobs")
+    return counts
+
+
+async def _promote_member(db, root_id: str):
+    """Make the earliest remaining duplicate of an archived job its cluster's representative."""
+    cursor = await db.execute("""
+        SELECT id FROM jobs WHERE duplicate_of = ? ORDER BY scraped_at, rowid LIMIT 1
+    """, (root_id,))
+    row = await cursor.fetchone()
+    if not row:
+        return
+    await db.execute("UPDATE jobs SET duplicate_of = NULL WHERE id = ?", (row[0],))
+    await db.execute("UPDATE jobs SET duplicate_of = ? WHERE duplicate_of = ?", (row[0], root_id))
+
+
+async def get_archived_job(job_id: str) -> Optional[Dict]:
+    async with aiosqlite.connect(utils.DB_PATH) as db:
+        await _attach_archive(db)
+        cursor = await db.execute("SELECT data FROM archive.jobs_archive WHERE id = ?", (job_id,))
+        row = await cursor.fetchone()
+    if not row:
+        return None
+    return json.loads(_decompressor.decompress(row[0]))
+
+
+async def run_maintenance(now: Optional[float] = None) -> Dict[str, int]:
+    """
+    Scheduled upkeep: archive old jobs, give freed pages back with an
+    incremental vacuum, and keep query planner statistics fresh.
+    """
+    async with aiosqlite.connect(utils.DB_PATH) as db:
+        cursor = await db.execute("SELECT count(*) FROM jobs")
+        live_before = (await cursor.fetchone())[0]
+
+    counts = await archive_jobs(now)
+    archived = sum(counts.values())
+
+    async with aiosqlite.connect(utils.DB_PATH) as db:
+        # Merge FTS segments left behind by deletes before reclaiming pages
+        await db.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('optimize')")
+        if live_before and archived / live_before >= ANALYZE_CHANGE_RATIO:
+            await db.execute("ANALYZE")
+        await db.execute("PRAGMA optimize")
+        await db.commit()
+
+        cursor = await db.execute("PRAGMA freelist_count")
+        free_pages = (await cursor.fetchone())[0]
+        # incremental_vacuum frees one page per step and execute() only steps
+        # once; executescript() runs it to completion
+        await db.executescript(f"PRAGMA incremental_vacuum({VACUUM_PAGES_PER_RUN});")
+
+    counts["freed_pages"] = min(free_pages, VACUUM_PAGES_PER_RUN)
+    logging.info(f"[retention] Maintenance done: {counts}")
+    return counts
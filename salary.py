@@ -0,0 +1,87 @@
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# Used to turn day rates into hourly and week/month pay into yearly figures
+HOURS_PER_DAY = 7.5
+WEEKS_PER_YEAR = 52
+MONTHS_PER_YEAR = 12
+
+# A unit may follow the figure directly ("£12ph", "£300pw"), so a £ amount
+# only needs its k (if any) to end the word, not the number itself
+_AMOUNT = re.compile(r"£\s*(\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?)\s*(k\b)?|(\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?)\s*(k)\b",
+                     re.IGNORECASE)
+# The far end of a range: "£10 - £12", "£10–12", "£20 to 25k"
+_RANGE_END = re.compile(r"\s*(?:-|–|—|to)\s*£?\s*(\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?)\s*(k\b)?", re.IGNORECASE)
+_PERIODS = [
+    ("hour", re.compile(r"\b(?:an?|per|/)\s*hour\b|\bhourly\b|(?:\b|(?<=\d))p/?h\b", re.IGNORECASE)),
+    ("day", re.compile(r"\b(?:an?|per|/)\s*day\b|\bdaily\b", re.IGNORECASE)),
+    ("week", re.compile(r"\b(?:an?|per|/)\s*week\b|\bweekly\b|(?:\b|(?<=\d))p/?w\b", re.IGNORECASE)),
+    ("month", re.compile(r"\b(?:an?|per|/)\s*month\b|\bmonthly\b|\bpcm\b", re.IGNORECASE)),
+    ("year", re.compile(r"\b(?:an?|per|/)\s*(?:year|annum)\b|\bannual(?:ly)?\b|\bp\.?a\.?\b", re.IGNORECASE)),
+]
+
+
+def _value(match) -> float:
+    number, k = (match.group(1), match.group(2)) if match.group(1) else (match.group(3), match.group(4))
+    value = float(number.replace(",", ""))
+    return value * 1000 if k else value
+
+
+def _first_amount(text: str):
+    """
+    The first figure or range in `text` as (lowest value, end of the text
+    that describes it). Later figures are extras ("+ £500 bonus", "holiday
+    pay of £1.47") and only mark where the period phrase has to end.
+    """
+    first = _AMOUNT.search(text)
+    if not first:
+        return None, len(text)
+    value, end = _value(first), first.end()
+    second = _RANGE_END.match(text, end)
+    if second:
+        high = _value(second)
+        # "£20-25k": the k applies to both ends
+        if second.group(2) and value < 1000:
+            value *= 1000
+        value, end = min(value, high), second.end()
+    following = _AMOUNT.search(text, end)
+    return value, following.start() if following else len(text)
+
+
+def _period(text: str, amount: float) -> str:
+    for name, pattern in _PERIODS:
+        if pattern.search(text):
+            return name
+    # No unit given: small figures are hourly rates, large ones salaries
+    return "hour" if amount < 100 else "year"
+
+
+@lru_cache(maxsize=4096)
+def parse_salary(text: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Normalize an Indeed salary snippet to (salary_hourly, salary_yearly).
+
+    Handles single figures, ranges ("£10.50 - £12.00 an hour"), "Up to",
+    "From" and "k" suffixes. Ranges use their lower bound so thresholds are
+    checked against the guaranteed pay. Only the first figure or range
+    counts; bonuses and extras quoted after it are ignored. Hourly and daily rates fill
+    salary_hourly; weekly, monthly and yearly pay fill salary_yearly.
+    Snippets without a recognisable amount give (None, None).
+    """
+    if not text:
+        return None, None
+    amount, end = _first_amount(text)
+    if amount is None:
+        return None, None
+
+    period = _period(text[:end], amount)
+    if period == "hour":
+        return round(amount, 2), None
+    if period == "day":
+        return round(amount / HOURS_PER_DAY, 2), None
+    if period == "week":
+        return None, round(amount * WEEKS_PER_YEAR, 2)
+    if period == "month":
+        return None, round(amount * MONTHS_PER_YEAR, 2)
+    return None, round(amount, 2)
@@ -5,8 +5,11 @@ import logging
 from bot_runner import BotRunner
 from telegram_bot import TelegramBot
 from config import TIMEZONE
+from retention import run_maintenance
 
 bot_bot = BotRunner()
+# The one TelegramBot of this process: it both sends the scheduled jobs and
+# polls for their button taps (see start_schedulers)
 telegram_bot = TelegramBot()
 
 # Active background tasks (to avoid GC of asyncio.create_task)
@@ -62,15 +65,38 @@ async def send_jobs_scheduler():
             logging.exception(f"[scheduler] Error in send_jobs task: {e}")
 
 
+# ────────────────────────────────
+# Database maintenance: 04:00 daily
+# ────────────────────────────────
+async def maintenance_scheduler():
+    maintenance_time = time(4, 0)
+
+    while True:
+        await wait_until(maintenance_time)
+
+        logging.info("[scheduler] Running database maintenance")
+        try:
+            await run_maintenance()
+        except Exception as e:
+            logging.exception(f"[scheduler] Error in maintenance task: {e}")
+
+
 # ────────────────────────────────
 # Main scheduler entry point
 # ────────────────────────────────
 async def start_schedulers():
-    task1 = asyncio.create_task(scrape_scheduler())
-    task2 = asyncio.create_task(send_jobs_scheduler())
-
-    active_tasks.update([task1, task2])
-    await asyncio.gather(task1, task2)
+    # Poll on the same instance that sends, so taps hit its job cache and
+    # feedback queue
+    await telegram_bot.start()
+    try:
+        task1 = asyncio.create_task(scrape_scheduler())
+        task2 = asyncio.create_task(send_jobs_scheduler())
+        task3 = asyncio.create_task(maintenance_scheduler())
+
+        active_tasks.update([task1, task2, task3])
+        await asyncio.gather(task1, task2, task3)
+    finally:
+        await telegram_bot.stop()
 
 
 if __name__ == "__main__":
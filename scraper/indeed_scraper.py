@@ -2,13 +2,28 @@ import httpx
 from bs4 import BeautifulSoup
 import asyncio
 import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from config import config
+from scraper.page_archive import ARCHIVE_DIR, KIND_RESULTS, PageArchive
 
 BASE_URL = "https://uk.indeed.com/jobs"
 LOCATION = "Leigh WN7 1NX"
 JOB_TYPE = "part-time"
+MAX_RETRIES = 3
+# Page archiving is opt-in: set PAGE_ARCHIVE_DIR in config to keep fetched
+# result pages. The archive is append-only, so prune it by deleting the dir.
+PAGE_ARCHIVE_DIR = getattr(config, "PAGE_ARCHIVE_DIR", None)
+
 
+def _retry_after_seconds(resp, attempt):
+    try:
+        return float(resp.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return 2 ** attempt
 
-async def fetch_jobs(session, start=0, limit=50):
+
+async def fetch_jobs(session, start=0, limit=50, base_url=BASE_URL, archive=None):
     params = {
         "q": JOB_TYPE,
         "l": LOCATION,
@@ -16,13 +31,22 @@ async def fetch_jobs(session, start=0, limit=50):
         "limit": limit,
         "jt": JOB_TYPE,
     }
-    try:
-        resp = await session.get(BASE_URL, params=params, timeout=15)
-        resp.raise_for_status()
-        return resp.text
-    except Exception as e:
-        logging.warning(f"[IndeedScraper] HTTP error fetching jobs start={start}: {e}")
-        return None
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            resp = await session.get(base_url, params=params, timeout=15)
+            if resp.status_code == 429 and attempt < MAX_RETRIES:
+                delay = _retry_after_seconds(resp, attempt)
+                logging.warning(f"[IndeedScraper] Rate limited at start={start}, retrying in {delay}s")
+                await asyncio.sleep(delay)
+                continue
+            resp.raise_for_status()
+            if archive is not None:
+                archive.append(str(resp.url), resp.text, kind=KIND_RESULTS)
+            return resp.text
+        except Exception as e:
+            logging.warning(f"[IndeedScraper] HTTP error fetching jobs start={start}: {e}")
+            return None
+    return None
 
 
 def parse_job_card(card):
@@ -58,39 +82,93 @@ def parse_job_card(card):
         return None
 
 
-async def scrape_indeed_jobs(limit=33, filters=None):
-    async with httpx.AsyncClient() as session:
-        all_jobs = []
-        start = 0
-
-        while len(all_jobs) < limit:
-            html = await fetch_jobs(session, start=start)
-            if not html:
-                break
-
-            soup = BeautifulSoup(html, "html.parser")
-            job_cards = soup.select("div.job_seen_beacon")
-
-            if not job_cards:
-                break
-
-            for card in job_cards:
-                job = parse_job_card(card)
-                if job:
-                    all_jobs.append(job)
-                    if len(all_jobs) >= limit:
-                        break
-
-            start += 10
-
-        return all_jobs[:limit]
-
-
-# Manual test runner
+def parse_results_page(html):
+    soup = BeautifulSoup(html, "html.parser")
+    jobs = []
+    for card in soup.select("div.job_seen_beacon"):
+        job = parse_job_card(card)
+        if job:
+            jobs.append(job)
+    return jobs
+
+
+async def scrape_indeed_jobs(limit=33, filters=None, base_url=BASE_URL, archive_dir=PAGE_ARCHIVE_DIR):
+    """
+    Scrape up to `limit` jobs. With `archive_dir` set (PAGE_ARCHIVE_DIR by
+    default, off when None) every fetched result page is kept in the page
+    archive so it can be re-parsed later with replay_archive() instead of
+    being fetched again.
+    """
+    archive = PageArchive(archive_dir) if archive_dir else None
+    try:
+        async with httpx.AsyncClient() as session:
+            all_jobs = []
+            start = 0
+
+            while len(all_jobs) < limit:
+                html = await fetch_jobs(session, start=start, base_url=base_url, archive=archive)
+                if not html:
+                    break
+
+                jobs = parse_results_page(html)
+                if not jobs:
+                    break
+
+                all_jobs.extend(jobs[:limit - len(all_jobs)])
+                start += 10
+
+            return all_jobs[:limit]
+    finally:
+        if archive is not None:
+            archive.close()
+
+
+def replay_archive(archive_dir=None, since=None, workers=1):
+    """
+    Re-run parsing over archived result pages without touching the network.
+    Jobs are de-duplicated by id, keeping the most recent capture. With
+    workers > 1 pages are parsed in a process pool.
+    """
+    with PageArchive(archive_dir or PAGE_ARCHIVE_DIR or ARCHIVE_DIR) as archive:
+        pages = [page.html for page in archive.pages(kind=KIND_RESULTS, since=since)]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = list(pool.map(parse_results_page, pages, chunksize=16))
+    else:
+        parsed = [parse_results_page(html) for html in pages]
+
+    jobs = {}
+    for page_jobs in parsed:
+        for job in page_jobs:
+            jobs[job["id"]] = job
+    logging.info(f"[IndeedScraper] Replayed {len(pages)} archived pages into {len(jobs)} jobs")
+    return list(jobs.values())
+
+
+async def replay_into_db(archive_dir=None, since=None, workers=1):
+    """
+    Replay the archive and write the re-parsed fields back into jobs.db,
+    overwriting what the old parser stored for jobs that already exist.
+    """
+    from utils import init_db, save_jobs
+
+    jobs = await asyncio.to_thread(replay_archive, archive_dir, since, workers)
+    await init_db()
+    await save_jobs(jobs, update_existing=True)
+    return jobs
+
+
+# Manual test runner: python -m scraper.indeed_scraper [--replay [--save]]
 if __name__ == "__main__":
-    import asyncio
-
-    results = asyncio.run(scrape_indeed_jobs(limit=10))
+    import sys
+
+    if "--replay" in sys.argv and "--save" in sys.argv:
+        results = asyncio.run(replay_into_db())
+    elif "--replay" in sys.argv:
+        results = replay_archive()
+    else:
+        results = asyncio.run(scrape_indeed_jobs(limit=10))
     print(f"Scraped {len(results)} jobs")
     for job in results:
         print(job)
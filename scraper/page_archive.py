@@ -0,0 +1,149 @@
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import time
+from typing import Iterator, List, NamedTuple, Optional
+
+import zstandard
+
+ARCHIVE_DIR = os.path.join(os.getcwd(), "page_archive")
+DATA_FILE = "pages.zst"
+INDEX_FILE = "pages.idx"
+
+KIND_RESULTS = "results"
+KIND_DETAIL = "detail"
+_KIND_CODES = {KIND_RESULTS: 0, KIND_DETAIL: 1}
+_KIND_NAMES = {v: k for k, v in _KIND_CODES.items()}
+
+# offset, compressed length, fetched_at, url hash, kind, padding -> 32 bytes
+_INDEX_ENTRY = struct.Struct("<QIdQB3x")
+# url length prefix inside each compressed frame
+_URL_LEN = struct.Struct("<H")
+
+
+class ArchivedPage(NamedTuple):
+    url: str
+    fetched_at: float
+    kind: str
+    html: str
+
+
+class _Entry(NamedTuple):
+    offset: int
+    length: int
+    fetched_at: float
+    url_hash: int
+    kind: str
+
+
+def url_hash(url: str) -> int:
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class PageArchive:
+    """
+    Append-only archive of fetched pages.
+
+    Each page is its own zstd frame in `pages.zst`, prefixed with its URL;
+    `pages.idx` holds one fixed-size entry per page (offset, length, fetch
+    time, URL hash, kind). Both files are read through mmap, so lookups are
+    a dict hit plus a slice. Data is written before its index entry, so a
+    crash can only leave unreferenced bytes behind, never a dangling entry.
+    """
+
+    def __init__(self, path: str = ARCHIVE_DIR, level: int = 3):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.data_path = os.path.join(path, DATA_FILE)
+        self.index_path = os.path.join(path, INDEX_FILE)
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._data_fh = open(self.data_path, "ab")
+        self._index_fh = open(self.index_path, "ab")
+        self._data_map = None
+        self._entries: List[_Entry] = []
+        self._by_url = {}
+        self._load_index()
+
+    def _load_index(self):
+        size = os.path.getsize(self.index_path)
+        usable = size - size % _INDEX_ENTRY.size
+        if usable != size:
+            logging.warning(f"[PageArchive] Ignoring {size - usable} trailing bytes in {self.index_path}")
+        if not usable:
+            return
+        with open(self.index_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as idx:
+            for offset, length, fetched_at, h, kind in _INDEX_ENTRY.iter_unpack(idx[:usable]):
+                self._add_entry(_Entry(offset, length, fetched_at, h, _KIND_NAMES.get(kind, KIND_RESULTS)))
+
+    def _add_entry(self, entry: _Entry):
+        self._by_url.setdefault(entry.url_hash, []).append(len(self._entries))
+        self._entries.append(entry)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def append(self, url: str, html: str, kind: str = KIND_RESULTS, fetched_at: Optional[float] = None):
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        raw_url = url.encode("utf-8")
+        frame = self._compressor.compress(_URL_LEN.pack(len(raw_url)) + raw_url + html.encode("utf-8"))
+
+        offset = self._data_fh.seek(0, os.SEEK_END)
+        self._data_fh.write(frame)
+        self._data_fh.flush()
+
+        entry = _Entry(offset, len(frame), fetched_at, url_hash(url), kind)
+        self._index_fh.write(_INDEX_ENTRY.pack(entry.offset, entry.length, entry.fetched_at,
+                                               entry.url_hash, _KIND_CODES[kind]))
+        self._index_fh.flush()
+        self._add_entry(entry)
+
+    def _read(self, entry: _Entry) -> ArchivedPage:
+        end = entry.offset + entry.length
+        if self._data_map is None or len(self._data_map) < end:
+            # The file has grown since it was mapped; remap to cover new frames
+            if self._data_map is not None:
+                self._data_map.close()
+            with open(self.data_path, "rb") as f:
+                self._data_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        payload = self._decompressor.decompress(self._data_map[entry.offset:end])
+        (url_len,) = _URL_LEN.unpack_from(payload)
+        start = _URL_LEN.size
+        url = payload[start:start + url_len].decode("utf-8")
+        html = payload[start + url_len:].decode("utf-8")
+        return ArchivedPage(url, entry.fetched_at, entry.kind, html)
+
+    def get(self, url: str, before: Optional[float] = None) -> Optional[ArchivedPage]:
+        """Latest capture of `url`, optionally the latest one fetched before `before`."""
+        for i in reversed(self._by_url.get(url_hash(url), [])):
+            entry = self._entries[i]
+            if before is not None and entry.fetched_at >= before:
+                continue
+            page = self._read(entry)
+            if page.url == url:
+                return page
+        return None
+
+    def pages(self, kind: Optional[str] = None, since: Optional[float] = None) -> Iterator[ArchivedPage]:
+        """Iterate captures in fetch order, optionally filtered by kind and fetch time."""
+        for entry in self._entries:
+            if kind is not None and entry.kind != kind:
+                continue
+            if since is not None and entry.fetched_at < since:
+                continue
+            yield self._read(entry)
+
+    def close(self):
+        if self._data_map is not None:
+            self._data_map.close()
+            self._data_map = None
+        self._data_fh.close()
+        self._index_fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -14,9 +14,38 @@ from telegram.ext import (
     ContextTypes,
 )
 
-from config import TELEGRAM_TOKEN, TELEGRAM_CHAT_ID, MAX_JOBS_PER_BATCH
-from filters import filter_and_score_jobs
-from utils import load_jobs_from_db, mark_job_as_declined, get_job_by_id
+import numpy as np
+
+from callback_data import CallbackCodec
+from config import TELEGRAM_TOKEN, TELEGRAM_CHAT_ID, MAX_JOBS_PER_BATCH, config
+from filters import rank_jobs_for_profiles, salary_floor
+from hf_ranker import HFMatcher, job_text
+from job_cache import FeedbackWriter, JobCache
+from utils import (
+    load_jobs_from_db,
+    get_job_by_id,
+    load_profiles,
+    load_implicit_profile,
+    get_profile,
+    save_profile,
+    load_job_embeddings,
+    save_job_embeddings,
+    search_jobs,
+)
+
+SEARCH_PAGE_SIZE = 5
+# Unix timestamp until which unsigned pre-versioning buttons are still accepted; off by default
+LEGACY_CALLBACKS_UNTIL = getattr(config, "LEGACY_CALLBACKS_UNTIL", None)
+
+# /prefs key -> (profile column, parser)
+PREF_KEYS = {
+    "radius": ("radius_miles", float),
+    "hourly": ("min_salary_hourly", float),
+    "yearly": ("min_salary_yearly", float),
+    "lat": ("center_lat", float),
+    "lon": ("center_lon", float),
+    "min_score": ("min_score_without_salary", float),
+}
 
 
 class TelegramJobBot:
@@ -40,43 +69,167 @@ class TelegramJobBot:
 
 
 class TelegramBot:
-    def __init__(self):
-        self.bot_app = Application.builder().token(TELEGRAM_TOKEN).build()
+    def __init__(self, base_url=None):
+        builder = Application.builder().token(TELEGRAM_TOKEN)
+        if base_url:
+            # Point the Bot API at another server (e.g. the benchmark's fake API)
+            builder = builder.base_url(base_url)
+        self.bot_app = builder.post_shutdown(self._flush_feedback).build()
+        self._matcher = None
+
+        # Callback hot path state: recently sent jobs, queued feedback writes
+        self.job_cache = JobCache()
+        self.feedback = FeedbackWriter()
+        self.callbacks = CallbackCodec(TELEGRAM_TOKEN, legacy_until=LEGACY_CALLBACKS_UNTIL)
 
         # Commands
         self.bot_app.add_handler(CommandHandler("test", self.send_random_job))
+        self.bot_app.add_handler(CommandHandler("cv", self.set_cv))
+        self.bot_app.add_handler(CommandHandler("prefs", self.set_prefs))
+        self.bot_app.add_handler(CommandHandler("search", self.search))
         self.bot_app.add_handler(CallbackQueryHandler(self.handle_callback))
 
+    async def _flush_feedback(self, application=None):
+        await self.feedback.flush()
+
+    @property
+    def matcher(self):
+        # Loading the model is slow, so only do it once something needs embeddings
+        if self._matcher is None:
+            self._matcher = HFMatcher()
+        return self._matcher
+
+    async def _job_embeddings(self, jobs):
+        """Embedding matrix for `jobs`, encoding (and storing) only the ones not seen before."""
+        stored = await load_job_embeddings([job["id"] for job in jobs])
+        missing = [job for job in jobs if job["id"] not in stored]
+        if missing:
+            logging.info(f"[telegram] Embedding {len(missing)} new jobs")
+            new = await asyncio.to_thread(self.matcher.embed, [job_text(job) for job in missing])
+            fresh = {job["id"]: emb for job, emb in zip(missing, new)}
+            await save_job_embeddings(fresh)
+            stored.update(fresh)
+        return np.stack([stored[job["id"]] for job in jobs])
+
+    async def _rank_for_profiles(self, jobs, profiles):
+        job_embeddings = await self._job_embeddings(jobs)
+        return rank_jobs_for_profiles(jobs, profiles, job_embeddings, MAX_JOBS_PER_BATCH)
+
+    async def _dispatch_profiles(self):
+        profiles = await load_profiles()
+        if str(TELEGRAM_CHAT_ID) not in {p["chat_id"] for p in profiles}:
+            # The config chat always gets jobs, on default filters unless it
+            # registered its own profile; its feedback still trains and applies
+            profiles.append(await load_implicit_profile(TELEGRAM_CHAT_ID))
+        return profiles
+
     async def send_jobs_to_chat(self):
         logging.info("[telegram] Fetching jobs for Telegram dispatch")
-        jobs = await load_jobs_from_db()
+        # Queued declines should land before we pick what to send
+        await self.feedback.try_flush()
+        profiles = await self._dispatch_profiles()
+        jobs = await load_jobs_from_db(*salary_floor(profiles))
 
         if not jobs:
             logging.info("[telegram] No jobs to send")
             return
 
-        filtered_jobs = await filter_and_score_jobs(jobs)
-        selected_jobs = filtered_jobs[:MAX_JOBS_PER_BATCH]
-
-        for job in selected_jobs:
-            await self.send_job(job)
+        ranked = await self._rank_for_profiles(jobs, profiles)
+        for chat_id, chat_jobs in ranked.items():
+            logging.info(f"[telegram] Sending {len(chat_jobs)} jobs to chat {chat_id}")
+            for job in chat_jobs:
+                await self.send_job(job, chat_id=chat_id)
 
     async def send_random_job(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         logging.info("[telegram] /test command triggered")
-        jobs = await load_jobs_from_db()
+        await self.feedback.try_flush()
+        chat_id = update.effective_chat.id
+        profile = await get_profile(chat_id) or await load_implicit_profile(chat_id)
+        jobs = await load_jobs_from_db(*salary_floor([profile]))
         if not jobs:
-            await context.bot.send_message(chat_id=update.effective_chat.id, text="No jobs available.")
+            await context.bot.send_message(chat_id=chat_id, text="No jobs available.")
             return
 
-        filtered_jobs = await filter_and_score_jobs(jobs)
+        filtered_jobs = (await self._rank_for_profiles(jobs, [profile]))[profile["chat_id"]]
         if not filtered_jobs:
-            await context.bot.send_message(chat_id=update.effective_chat.id, text="No suitable jobs found.")
+            await context.bot.send_message(chat_id=chat_id, text="No suitable jobs found.")
             return
 
         job = random.choice(filtered_jobs)
-        await self.send_job(job)
+        await self.send_job(job, chat_id=chat_id)
+
+    async def set_cv(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        chat_id = update.effective_chat.id
+        cv_text = " ".join(context.args).strip()
+        if not cv_text:
+            await context.bot.send_message(chat_id=chat_id, text="Usage: /cv <your CV text>")
+            return
+
+        embedding = (await asyncio.to_thread(self.matcher.embed, [cv_text]))[0]
+        await save_profile(chat_id, cv_text=cv_text, cv_embedding=embedding)
+        logging.info(f"[telegram] Stored CV for chat {chat_id}")
+        await context.bot.send_message(chat_id=chat_id, text="CV saved. Jobs will now be ranked against it.")
+
+    async def set_prefs(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        chat_id = update.effective_chat.id
+        fields = {}
+        for arg in context.args:
+            key, _, value = arg.partition("=")
+            if key not in PREF_KEYS:
+                await context.bot.send_message(
+                    chat_id=chat_id,
+                    text=f"Unknown setting '{key}'. Use: {', '.join(f'{k}=<n>' for k in PREF_KEYS)}"
+                )
+                return
+            column, parse = PREF_KEYS[key]
+            try:
+                fields[column] = parse(value)
+            except ValueError:
+                await context.bot.send_message(chat_id=chat_id, text=f"'{value}' is not a number.")
+                return
 
-    async def send_job(self, job):
+        if fields:
+            await save_profile(chat_id, **fields)
+        profile = await get_profile(chat_id) or {}
+        summary = "\n".join(
+            f"{key}: {'default' if profile.get(column) is None else profile[column]}"
+            for key, (column, _) in PREF_KEYS.items()
+        )
+        await context.bot.send_message(chat_id=chat_id, text=f"Your settings:\n{summary}")
+
+    async def search(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        chat_id = update.effective_chat.id
+        text = " ".join(context.args).strip()
+        if not text:
+            await context.bot.send_message(chat_id=chat_id, text="Usage: /search <words>")
+            return
+        # Callback data is capped at 64 bytes, so the query lives in chat_data
+        context.chat_data["search_query"] = text
+        await self.send_search_page(chat_id, text, 0)
+
+    async def send_search_page(self, chat_id, text, page):
+        await self.feedback.try_flush()
+        # Fetch one extra row to know whether there is a next page
+        results = await search_jobs(text, limit=SEARCH_PAGE_SIZE + 1, offset=page * SEARCH_PAGE_SIZE,
+                                    chat_id=chat_id)
+        if not results:
+            message = "No matching jobs." if page == 0 else "No more results."
+            await self.bot_app.bot.send_message(chat_id=chat_id, text=message)
+            return
+
+        for job in results[:SEARCH_PAGE_SIZE]:
+            await self.send_job(job, chat_id=chat_id)
+
+        if len(results) > SEARCH_PAGE_SIZE:
+            await self.bot_app.bot.send_message(
+                chat_id=chat_id,
+                text=f"Page {page + 1} of results for \"{text}\"",
+                reply_markup=InlineKeyboardMarkup([[
+                    InlineKeyboardButton("More ▶", callback_data=self.callbacks.encode("more", page + 1, chat_id))
+                ]])
+            )
+
+    async def send_job(self, job, chat_id=TELEGRAM_CHAT_ID):
         message = f"*{job['title']}* at _{job['company']}_\n\n"
         message += f"💷 Salary: {job.get('salary', 'N/A')}\n"
         message += f"📍 Location: {job.get('location', 'N/A')}\n"
@@ -84,37 +237,74 @@ class TelegramBot:
 
         buttons = [
             [
-                InlineKeyboardButton("✅ Accept", callback_data=f"accept_{job['id']}"),
-                InlineKeyboardButton("❌ Decline", callback_data=f"decline_{job['id']}")
+                InlineKeyboardButton("✅ Accept", callback_data=self.callbacks.encode("accept", job["id"], chat_id)),
+                InlineKeyboardButton("❌ Decline", callback_data=self.callbacks.encode("decline", job["id"], chat_id))
             ]
         ]
 
         await self.bot_app.bot.send_message(
-            chat_id=TELEGRAM_CHAT_ID,
+            chat_id=chat_id,
             text=message,
             parse_mode="Markdown",
             reply_markup=InlineKeyboardMarkup(buttons),
             disable_web_page_preview=True
         )
+        self.job_cache.put(job)
 
     async def handle_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         query = update.callback_query
         await query.answer()
 
-        action, job_id = query.data.split("_", 1)
-        job = await get_job_by_id(job_id)
+        chat_id = query.message.chat_id
+        callback = self.callbacks.decode(query.data, chat_id)
+        if callback is None:
+            await query.edit_message_text("This button is no longer valid.")
+            return
+
+        action, job_id = callback
+        if action == "more":
+            text = context.chat_data.get("search_query")
+            if not text:
+                await query.edit_message_text("Search expired, run /search again.")
+                return
+            await query.edit_message_reply_markup(reply_markup=None)
+            await self.send_search_page(chat_id, text, int(job_id))
+            return
+
+        # Jobs sent since startup are in memory; only older buttons hit the DB
+        job = self.job_cache.get(job_id) or await get_job_by_id(job_id)
 
         if not job:
             await query.edit_message_text("Job no longer available.")
             return
 
         if action == "accept":
+            self.feedback.add(chat_id, job_id, accepted=True)
             await query.edit_message_text(f"You accepted: {job['title']} at {job['company']}")
         elif action == "decline":
-            await mark_job_as_declined(job_id)
+            self.feedback.add(chat_id, job_id, accepted=False)
             await query.edit_message_text(f"You declined: {job['title']} at {job['company']}")
         else:
             await query.edit_message_text("Unknown action.")
 
+    # Sending and callback handling must happen on the same instance: the job
+    # cache and the feedback queue live in memory. Run one TelegramBot per
+    # process, either via run_polling() or start()/stop() next to the scheduler.
     def run_polling(self):
         self.bot_app.run_polling()
+
+    async def start(self):
+        """Start polling for updates inside an already running event loop."""
+        await self.bot_app.initialize()
+        await self.bot_app.start()
+        await self.bot_app.updater.start_polling()
+        logging.info("[telegram] Polling for updates")
+
+    async def stop(self):
+        await self.bot_app.updater.stop()
+        await self.bot_app.stop()
+        try:
+            # post_shutdown only runs under run_polling(), so flush here
+            await self.feedback.flush()
+        finally:
+            await self.bot_app.shutdown()
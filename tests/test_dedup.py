@@ -0,0 +1,70 @@
+import asyncio
+
+import aiosqlite
+import pytest
+
+import utils
+from dedup import short_duplicate
+
+BASE = {"title": "Retail Assistant", "company": "Tesco", "location": "Leigh WN7", "salary": "£11.44 an hour"}
+DESCRIPTION = ("Join our friendly team serving customers on the tills, restocking shelves and keeping "
+               "the shop floor tidy across weekend shifts in our busy Leigh store.")
+
+
+def job(job_id, **fields):
+    return dict(BASE, id=job_id, url=f"https://uk.indeed.com/viewjob?jk={job_id}", **fields)
+
+
+@pytest.mark.parametrize("changes", [
+    {"company": "Hays Recruitment"},
+    {"location": "Leigh WN7 1NX"},
+    {"title": "retail assistant", "salary": "£11.44 per hour"},
+])
+def test_reposts_without_description_collapse(changes):
+    assert short_duplicate(BASE, dict(BASE, **changes))
+
+
+@pytest.mark.parametrize("first, second", [
+    (BASE, dict(BASE, title="Retail Supervisor")),
+    (BASE, dict(BASE, location="Wigan WN1")),
+    (BASE, dict(BASE, salary="£12.00 an hour")),
+    # Without pay to compare, the company has to match
+    (dict(BASE, salary=""), dict(BASE, company="Tesco Stores", salary="")),
+])
+def test_distinct_jobs_without_description_stay_apart(first, second):
+    assert not short_duplicate(first, second)
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "jobs.db")
+    monkeypatch.setattr(utils, "DB_PATH", path)
+    asyncio.run(utils.init_db())
+    return path
+
+
+def duplicate_of(path):
+    async def query():
+        async with aiosqlite.connect(path) as db:
+            cursor = await db.execute("SELECT id, duplicate_of FROM jobs")
+            return dict(await cursor.fetchall())
+    return asyncio.run(query())
+
+
+def test_save_jobs_collapses_agency_and_location_reposts(db_path):
+    asyncio.run(utils.save_jobs([
+        job("a"),
+        job("b", company="Hays Recruitment"),
+        job("c", location="Leigh WN7 1NX"),
+        job("d", title="Retail Supervisor"),
+    ]))
+    assert duplicate_of(db_path) == {"a": None, "b": "a", "c": "a", "d": None}
+
+
+def test_described_jobs_collapse_on_minhash(db_path):
+    asyncio.run(utils.save_jobs([
+        job("a", description=DESCRIPTION),
+        job("b", company="Tesco Stores", salary="", description=DESCRIPTION + " Apply today."),
+        job("c", description="Night shift warehouse picking and packing role with forklift training provided."),
+    ]))
+    assert duplicate_of(db_path) == {"a": None, "b": "a", "c": None}
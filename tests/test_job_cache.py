@@ -0,0 +1,43 @@
+import asyncio
+
+import job_cache
+from job_cache import FeedbackWriter
+
+
+def test_failed_flush_is_retried(monkeypatch):
+    written, failures = [], [1]
+
+    async def record_feedback_batch(batch):
+        if failures:
+            failures.pop()
+            raise RuntimeError("database is locked")
+        written.extend(batch)
+
+    monkeypatch.setattr(job_cache, "record_feedback_batch", record_feedback_batch)
+
+    async def run():
+        writer = FeedbackWriter(interval=0.01)
+        writer.add(1, "job", accepted=False)
+        await asyncio.sleep(0.1)
+        return writer
+
+    writer = asyncio.run(run())
+    assert written == [("1", "job", False)]
+    assert len(writer) == 0
+
+
+def test_try_flush_keeps_items_and_carries_on(monkeypatch):
+    async def record_feedback_batch(batch):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(job_cache, "record_feedback_batch", record_feedback_batch)
+
+    async def run():
+        writer = FeedbackWriter(interval=60)
+        writer.add(1, "job", accepted=True)
+        ok = await writer.try_flush()
+        retrying = writer._timer is not None and not writer._timer.done()
+        writer._timer.cancel()
+        return ok, len(writer), retrying
+
+    assert asyncio.run(run()) == (False, 1, True)
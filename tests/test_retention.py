@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+import aiosqlite
+import pytest
+
+# retention reads its policies and the config chat from the deployment's config.py
+pytest.importorskip("config")
+
+import retention  # noqa: E402
+import utils  # noqa: E402
+from config import TELEGRAM_CHAT_ID  # noqa: E402
+
+CONFIG_CHAT = str(TELEGRAM_CHAT_ID)
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "jobs.db")
+    monkeypatch.setattr(utils, "DB_PATH", path)
+
+    async def setup():
+        await utils.init_db()
+        await utils.save_jobs([{
+            "id": "job", "title": "Retail Assistant", "company": "Tesco",
+            "location": "Leigh WN7", "salary": "£11.44 an hour", "url": "https://uk.indeed.com/viewjob?jk=job",
+        }])
+        await utils.save_profile(1)
+        await utils.save_profile(2)
+        # Old enough for declined retention, too young to expire
+        async with aiosqlite.connect(path) as db:
+            await db.execute("UPDATE jobs SET scraped_at = ?",
+                             (time.time() - (retention.DECLINED_RETENTION_DAYS + 1) * 86400,))
+            await db.commit()
+
+    asyncio.run(setup())
+    return path
+
+
+def decline_and_archive(*chat_ids):
+    async def run():
+        await utils.record_feedback_batch([(chat_id, "job", False) for chat_id in chat_ids])
+        counts = await retention.archive_jobs()
+        return counts, await utils.get_job_by_id("job")
+    return asyncio.run(run())
+
+
+def test_declines_from_chats_without_profile_do_not_count(db_path):
+    counts, job = decline_and_archive("42", "1", "43")
+    assert counts == {"declined": 0, "expired": 0}
+    assert job is not None
+
+
+def test_job_declined_by_every_receiving_chat_is_archived(db_path):
+    counts, job = decline_and_archive("1", "2")
+    assert counts["declined"] == 0
+    assert job is not None
+
+    counts, job = decline_and_archive(CONFIG_CHAT)
+    assert counts == {"declined": 1, "expired": 0}
+    assert job is None
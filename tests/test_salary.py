@@ -0,0 +1,42 @@
+import pytest
+
+from salary import parse_salary
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("£11.44 an hour", (11.44, None)),
+    ("£10.50 - £12.00 an hour", (10.5, None)),
+    ("£10.50–12 per hour", (10.5, None)),
+    ("Up to £30,000 a year", (None, 30000.0)),
+    ("From £11 an hour", (11.0, None)),
+    ("£22k - £25k", (None, 22000.0)),
+    ("£20-25k a year", (None, 20000.0)),
+    ("25k per annum", (None, 25000.0)),
+    ("£400 a week", (None, 20800.0)),
+    ("£2,000 - £2,500 a month", (None, 24000.0)),
+    ("£90 a day", (12.0, None)),
+    ("£12.50", (12.5, None)),
+    ("£24,000", (None, 24000.0)),
+    ("£12ph", (12.0, None)),
+    ("£12p/h", (12.0, None)),
+    ("£10.50-£12ph", (10.5, None)),
+    ("£300pw", (None, 15600.0)),
+    ("£300p/w", (None, 15600.0)),
+])
+def test_request_formats(text, expected):
+    assert parse_salary(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("£25,000 a year + £500 bonus", (None, 25000.0)),
+    ("£12.21 an hour (plus holiday pay of £1.47)", (12.21, None)),
+    ("£11 - £12 an hour + £1,000 welcome bonus", (11.0, None)),
+    ("£400 a week plus £50 a day travel", (None, 20800.0)),
+])
+def test_bonus_and_extras_are_ignored(text, expected):
+    assert parse_salary(text) == expected
+
+
+@pytest.mark.parametrize("text", [None, "", "Competitive", "Depends on experience"])
+def test_no_amount(text):
+    assert parse_salary(text) == (None, None)
@@ -1,13 +1,22 @@
 import aiosqlite
 import logging
 import os
-from typing import List, Dict
+import re
+import time
+from typing import List, Dict, Optional
+
+import numpy as np
+
+from dedup import assign_duplicates, init_dedup_tables
+from preferences import update_preference
+from salary import parse_salary
 
 DB_PATH = os.path.join(os.getcwd(), "jobs.db")
 
 
 async def init_db():
     async with aiosqlite.connect(DB_PATH) as db:
+        vacuumed = await _enable_incremental_vacuum(db)
         await db.execute("""
             CREATE TABLE IF NOT EXISTS jobs (
                 id TEXT PRIMARY KEY,
@@ -17,22 +26,198 @@ async def init_db():
                 salary TEXT,
                 url TEXT,
                 raw_json TEXT,
-                declined INTEGER DEFAULT 0
+                declined INTEGER DEFAULT 0,
+                duplicate_of TEXT,
+                description TEXT,
+                salary_hourly REAL,
+                salary_yearly REAL,
+                scraped_at REAL
             )
         """)
+        added = await _add_missing_columns(db, "jobs", {
+            "duplicate_of": "TEXT",
+            "description": "TEXT",
+            "salary_hourly": "REAL",
+            "salary_yearly": "REAL",
+            "scraped_at": "REAL",
+        })
+        if "salary_hourly" in added:
+            await _backfill_salaries(db)
+        if "scraped_at" in added:
+            # Unknown age: retention counts existing rows from the upgrade
+            await db.execute("UPDATE jobs SET scraped_at = ?", (time.time(),))
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_jobs_scraped_at ON jobs (scraped_at)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_jobs_salary_hourly ON jobs (salary_hourly)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_jobs_salary_yearly ON jobs (salary_yearly)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_jobs_duplicate_of ON jobs (duplicate_of)")
+        # Ids moved to the archive by retention.py, so re-scrapes don't bring them back
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS archived_ids (
+                id TEXT PRIMARY KEY
+            ) WITHOUT ROWID
+        """)
+        await init_dedup_tables(db)
+        await _init_search_index(db)
+        if vacuumed:
+            # VACUUM may renumber jobs.rowid, which the search index is keyed on
+            await db.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS profiles (
+                chat_id TEXT PRIMARY KEY,
+                cv_text TEXT,
+                cv_embedding BLOB,
+                center_lat REAL,
+                center_lon REAL,
+                radius_miles REAL,
+                min_salary_hourly REAL,
+                min_salary_yearly REAL,
+                min_score_without_salary REAL
+            )
+        """)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS job_embeddings (
+                job_id TEXT PRIMARY KEY,
+                embedding BLOB NOT NULL
+            )
+        """)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS preferences (
+                chat_id TEXT PRIMARY KEY,
+                weights BLOB,
+                bias REAL DEFAULT 0,
+                accepts INTEGER DEFAULT 0,
+                declines INTEGER DEFAULT 0
+            )
+        """)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS job_feedback (
+                chat_id TEXT NOT NULL,
+                job_id TEXT NOT NULL,
+                action TEXT NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (chat_id, job_id)
+            )
+        """)
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_job_feedback_job ON job_feedback (job_id, action)")
         await db.commit()
 
 
-async def save_jobs(jobs: List[Dict]):
+async def _enable_incremental_vacuum(db) -> bool:
+    """
+    Switch the database to auto_vacuum=INCREMENTAL so freed pages can be
+    returned to the OS by retention.run_maintenance(). New databases just
+    need the pragma; existing ones need a one-off VACUUM (returns True).
+    """
+    cursor = await db.execute("PRAGMA auto_vacuum")
+    if (await cursor.fetchone())[0] == 2:
+        return False
+    await db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    cursor = await db.execute("SELECT count(*) FROM sqlite_master")
+    if not (await cursor.fetchone())[0]:
+        return False
+    logging.info("[db] Converting jobs.db to incremental auto-vacuum")
+    await db.execute("VACUUM")
+    return True
+
+
+async def _add_missing_columns(db, table: str, columns: Dict[str, str]) -> List[str]:
+    """Bring tables created by older versions up to date; returns the columns added."""
+    cursor = await db.execute(f"PRAGMA table_info({table})")
+    existing = {row[1] for row in await cursor.fetchall()}
+    added = []
+    for name, decl in columns.items():
+        if name not in existing:
+            await db.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+            added.append(name)
+    return added
+
+
+async def _backfill_salaries(db):
+    cursor = await db.execute("SELECT id, salary FROM jobs WHERE salary IS NOT NULL AND salary != ''")
+    updates = []
+    for job_id, text in await cursor.fetchall():
+        hourly, yearly = parse_salary(text)
+        if hourly is not None or yearly is not None:
+            updates.append((hourly, yearly, job_id))
+    await db.executemany("UPDATE jobs SET salary_hourly = ?, salary_yearly = ? WHERE id = ?", updates)
+    logging.info(f"[db] Parsed salaries for {len(updates)} existing jobs")
+
+
+async def _init_search_index(db):
+    """
+    FTS5 index over the jobs table (external content, so the text is not
+    stored twice), kept in sync by triggers so saving a job stays one write.
+    Rows are linked by jobs.rowid, which a full VACUUM may renumber; call
+    rebuild_search_index() after one.
+    """
+    cursor = await db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'")
+    exists = await cursor.fetchone()
+
+    await db.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+            title, company, location, description,
+            content='jobs', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts (rowid, title, company, location, description)
+            VALUES (new.rowid, new.title, new.company, new.location, new.description);
+        END
+    """)
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location, description)
+            VALUES ('delete', old.rowid, old.title, old.company, old.location, old.description);
+        END
+    """)
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, company, location, description ON jobs
+        BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location, description)
+            VALUES ('delete', old.rowid, old.title, old.company, old.location, old.description);
+            INSERT INTO jobs_fts (rowid, title, company, location, description)
+            VALUES (new.rowid, new.title, new.company, new.location, new.description);
+        END
+    """)
+    if not exists:
+        # Index rows saved before the search index existed
+        await db.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+
+
+async def rebuild_search_index():
+    async with aiosqlite.connect(DB_PATH) as db:
+        await db.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+        await db.commit()
+
+
+async def save_jobs(jobs: List[Dict], update_existing: bool = False):
+    """
+    Insert new jobs; ids already stored are left alone unless
+    update_existing is set, in which case their scraped fields are
+    overwritten (used when replaying archived pages through a fixed
+    parser). Declined state and scraped_at are never touched, and ids
+    already archived by retention are skipped. Updated jobs whose text
+    changed are re-embedded on next ranking and re-clustered for dedup.
+    """
     if not jobs:
         return
 
+    scraped_at = time.time()
     async with aiosqlite.connect(DB_PATH) as db:
+        inserted = []
+        updated = 0
+        changed = []
         for job in jobs:
             try:
-                await db.execute("""
-                    INSERT OR IGNORE INTO jobs (id, title, company, location, salary, url, raw_json)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                salary_hourly, salary_yearly = parse_salary(job.get("salary"))
+                cursor = await db.execute("""
+                    INSERT OR IGNORE INTO jobs (
+                        id, title, company, location, salary, url, raw_json, description,
+                        salary_hourly, salary_yearly, scraped_at
+                    )
+                    SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+                    WHERE NOT EXISTS (SELECT 1 FROM archived_ids WHERE id = ?)
                 """, (
                     job["id"],
                     job["title"],
@@ -40,20 +225,108 @@ async def save_jobs(jobs: List[Dict]):
                     job["location"],
                     job.get("salary", ""),
                     job["url"],
-                    str(job)  # store raw JSON as string fallback
+                    str(job),  # store raw JSON as string fallback
+                    job.get("description", ""),
+                    salary_hourly,
+                    salary_yearly,
+                    scraped_at,
+                    job["id"]
                 ))
+                if cursor.rowcount:
+                    inserted.append(job)
+                elif update_existing:
+                    cursor = await db.execute(f"SELECT {', '.join(_TEXT_FIELDS)} FROM jobs WHERE id = ?",
+                                              (job["id"],))
+                    before = await cursor.fetchone()
+                    cursor = await db.execute("""
+                        UPDATE jobs SET
+                            title = ?, company = ?, location = ?, salary = ?, url = ?, raw_json = ?,
+                            description = COALESCE(?, description),
+                            salary_hourly = ?, salary_yearly = ?
+                        WHERE id = ?
+                    """, (
+                        job["title"],
+                        job["company"],
+                        job["location"],
+                        job.get("salary", ""),
+                        job["url"],
+                        str(job),
+                        job.get("description"),
+                        salary_hourly,
+                        salary_yearly,
+                        job["id"]
+                    ))
+                    updated += cursor.rowcount
+                    if before:
+                        after = (job["title"], job["company"], job["location"], job.get("salary", ""),
+                                 before[-1] if job.get("description") is None else job["description"])
+                        if after != tuple(before):
+                            changed.append(job["id"])
             except Exception as e:
                 logging.warning(f"[db] Failed to save job {job['id']}: {e}")
+
+        # Collapse reposts so only one job per cluster reaches ranking and dispatch
+        duplicates = await assign_duplicates(db, inserted)
+        if duplicates:
+            logging.info(f"[db] Collapsed {len(duplicates)} near-duplicate jobs out of {len(inserted)} new")
+        if changed:
+            await _reindex_jobs(db, changed)
+        if updated:
+            logging.info(f"[db] Updated {updated} existing jobs, {len(changed)} with changed text")
         await db.commit()
 
 
-async def load_jobs_from_db() -> List[Dict]:
+# Fields the embeddings and MinHash signatures are built from
+_TEXT_FIELDS = ("title", "company", "location", "salary", "description")
+
+
+async def _reindex_jobs(db, job_ids: List[str]):
+    """
+    Forget the embeddings and dedup entries built from a job's old text and
+    cluster it again, together with any jobs marked as its duplicates.
+    """
+    jobs = []
+    # Stay under SQLite's default host-parameter limit
+    for i in range(0, len(job_ids), 450):
+        chunk = job_ids[i:i + 450]
+        placeholders = ",".join("?" for _ in chunk)
+        for table in ("job_embeddings", "job_minhash", "lsh_buckets"):
+            await db.execute(f"DELETE FROM {table} WHERE job_id IN ({placeholders})", chunk)
+        cursor = await db.execute(f"""
+            SELECT id, {', '.join(_TEXT_FIELDS)}, scraped_at FROM jobs
+            WHERE id IN ({placeholders}) OR duplicate_of IN ({placeholders})
+        """, chunk + chunk)
+        columns = [c[0] for c in cursor.description]
+        jobs.extend(dict(zip(columns, row)) for row in await cursor.fetchall())
+
+    jobs = sorted({job["id"]: job for job in jobs}.values(), key=lambda job: job["scraped_at"] or 0)
+    await db.executemany("UPDATE jobs SET duplicate_of = NULL WHERE id = ?", [(job["id"],) for job in jobs])
+    await assign_duplicates(db, jobs)
+
+
+async def load_jobs_from_db(min_hourly: Optional[float] = None,
+                            min_yearly: Optional[float] = None) -> List[Dict]:
+    """
+    Undeclined, non-duplicate jobs. With min_hourly/min_yearly the salary
+    threshold runs in SQL on the indexed salary columns: jobs paying below it
+    are dropped, jobs without a parsed salary are kept for later filters.
+    """
+    where = "declined = 0 AND duplicate_of IS NULL"
+    params = []
+    if min_hourly is not None or min_yearly is not None:
+        where += """ AND (
+            salary_hourly >= ?
+            OR (salary_hourly IS NULL AND (salary_yearly >= ? OR salary_yearly IS NULL))
+        )"""
+        params = [min_hourly if min_hourly is not None else 0,
+                  min_yearly if min_yearly is not None else 0]
+
     async with aiosqlite.connect(DB_PATH) as db:
-        cursor = await db.execute("""
-            SELECT id, title, company, location, salary, url, raw_json
+        cursor = await db.execute(f"""
+            SELECT id, title, company, location, salary, url, raw_json, salary_hourly, salary_yearly
             FROM jobs
-            WHERE declined = 0
-        """)
+            WHERE {where}
+        """, params)
         rows = await cursor.fetchall()
 
     jobs = []
@@ -65,7 +338,9 @@ async def load_jobs_from_db() -> List[Dict]:
             "location": row[3],
             "salary": row[4],
             "url": row[5],
-            "raw": row[6]
+            "raw": row[6],
+            "salary_hourly": row[7],
+            "salary_yearly": row[8]
         })
     return jobs
 
@@ -96,3 +371,225 @@ async def mark_job_as_declined(job_id: str):
     async with aiosqlite.connect(DB_PATH) as db:
         await db.execute("UPDATE jobs SET declined = 1 WHERE id = ?", (job_id,))
         await db.commit()
+
+
+_SEARCH_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_fts_query(text: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 query: every word must match, and the
+    last one also matches as a prefix so partial words still find results.
+    """
+    tokens = _SEARCH_TOKEN.findall(text)
+    if not tokens:
+        return None
+    terms = [f'"{t}"' for t in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+async def search_jobs(text: str, limit: int = 5, offset: int = 0, chat_id: Optional[str] = None) -> List[Dict]:
+    """
+    BM25-ranked full-text search over undeclined, non-duplicate jobs.
+    Title matches weigh most, then company, location and description.
+    With chat_id, jobs that chat declined are left out too.
+    """
+    fts_query = build_fts_query(text)
+    if not fts_query:
+        return []
+
+    async with aiosqlite.connect(DB_PATH) as db:
+        cursor = await db.execute("""
+            SELECT j.id, j.title, j.company, j.location, j.salary, j.url, j.raw_json,
+                   bm25(jobs_fts, 10.0, 4.0, 2.0, 1.0) AS rank
+            FROM jobs_fts
+            JOIN jobs j ON j.rowid = jobs_fts.rowid
+            WHERE jobs_fts MATCH ? AND j.declined = 0 AND j.duplicate_of IS NULL
+              AND NOT EXISTS (
+                  SELECT 1 FROM job_feedback f
+                  WHERE f.chat_id = ? AND f.job_id = j.id AND f.action = 'decline'
+              )
+            ORDER BY rank
+            LIMIT ? OFFSET ?
+        """, (fts_query, str(chat_id), limit, offset))
+        rows = await cursor.fetchall()
+
+    return [{
+        "id": row[0],
+        "title": row[1],
+        "company": row[2],
+        "location": row[3],
+        "salary": row[4],
+        "url": row[5],
+        "raw": row[6],
+        "rank": row[7]
+    } for row in rows]
+
+
+PROFILE_FIELDS = [
+    "chat_id", "cv_text", "cv_embedding", "center_lat", "center_lon", "radius_miles",
+    "min_salary_hourly", "min_salary_yearly", "min_score_without_salary",
+]
+
+
+# Profiles come with the chat's learned preference model, if any
+_PROFILE_SELECT = f"""
+    SELECT {', '.join(f'p.{field}' for field in PROFILE_FIELDS)}, pref.weights, pref.bias
+    FROM profiles p
+    LEFT JOIN preferences pref ON pref.chat_id = p.chat_id
+"""
+
+
+def _row_to_profile(row) -> Dict:
+    profile = dict(zip(PROFILE_FIELDS, row))
+    if profile["cv_embedding"] is not None:
+        profile["cv_embedding"] = np.frombuffer(profile["cv_embedding"], dtype=np.float32)
+    weights, bias = row[len(PROFILE_FIELDS):]
+    profile["pref_weights"] = np.frombuffer(weights, dtype=np.float32) if weights is not None else None
+    profile["pref_bias"] = bias or 0.0
+    return profile
+
+
+async def load_profiles() -> List[Dict]:
+    """Every profile, each with the set of job ids its chat declined ("declined_ids")."""
+    async with aiosqlite.connect(DB_PATH) as db:
+        cursor = await db.execute(_PROFILE_SELECT)
+        rows = await cursor.fetchall()
+    profiles = [_row_to_profile(row) for row in rows]
+    declined = await load_declined([p["chat_id"] for p in profiles])
+    for profile in profiles:
+        profile["declined_ids"] = declined[profile["chat_id"]]
+    return profiles
+
+
+async def get_profile(chat_id: str) -> Optional[Dict]:
+    async with aiosqlite.connect(DB_PATH) as db:
+        cursor = await db.execute(f"{_PROFILE_SELECT} WHERE p.chat_id = ?", (str(chat_id),))
+        row = await cursor.fetchone()
+    if not row:
+        return None
+    profile = _row_to_profile(row)
+    profile["declined_ids"] = (await load_declined([profile["chat_id"]]))[profile["chat_id"]]
+    return profile
+
+
+async def load_implicit_profile(chat_id: str) -> Dict:
+    """
+    Profile for a chat that never ran /cv or /prefs (the config chat before
+    anyone registers): config defaults and no CV, but with the chat's
+    learned preference model and declines.
+    """
+    async with aiosqlite.connect(DB_PATH) as db:
+        cursor = await db.execute("SELECT weights, bias FROM preferences WHERE chat_id = ?", (str(chat_id),))
+        pref = await cursor.fetchone()
+    profile = _row_to_profile((str(chat_id),) + (None,) * (len(PROFILE_FIELDS) - 1) + (pref or (None, None)))
+    profile["declined_ids"] = (await load_declined([profile["chat_id"]]))[profile["chat_id"]]
+    return profile
+
+
+async def load_declined(chat_ids: List[str]) -> Dict[str, set]:
+    """Job ids each chat has declined. Declines are per chat: they never hide a job from anyone else."""
+    declined = {str(chat_id): set() for chat_id in chat_ids}
+    if not declined:
+        return declined
+    async with aiosqlite.connect(DB_PATH) as db:
+        cursor = await db.execute(f"""
+            SELECT chat_id, job_id FROM job_feedback
+            WHERE action = 'decline' AND chat_id IN ({",".join("?" for _ in declined)})
+        """, list(declined))
+        for chat_id, job_id in await cursor.fetchall():
+            declined[chat_id].add(job_id)
+    return declined
+
+
+async def save_profile(chat_id: str, **fields):
+    """Create or update a chat's profile; only the given fields are changed."""
+    unknown = set(fields) - set(PROFILE_FIELDS[1:])
+    if unknown:
+        raise ValueError(f"Unknown profile fields: {', '.join(sorted(unknown))}")
+    if isinstance(fields.get("cv_embedding"), np.ndarray):
+        fields["cv_embedding"] = fields["cv_embedding"].astype(np.float32).tobytes()
+
+    async with aiosqlite.connect(DB_PATH) as db:
+        await db.execute("INSERT OR IGNORE INTO profiles (chat_id) VALUES (?)", (str(chat_id),))
+        if fields:
+            assignments = ", ".join(f"{name} = ?" for name in fields)
+            await db.execute(f"UPDATE profiles SET {assignments} WHERE chat_id = ?",
+                             (*fields.values(), str(chat_id)))
+        await db.commit()
+
+
+async def load_job_embeddings(job_ids: List[str]) -> Dict[str, np.ndarray]:
+    embeddings = {}
+    async with aiosqlite.connect(DB_PATH) as db:
+        # Stay under SQLite's default host-parameter limit
+        for i in range(0, len(job_ids), 900):
+            chunk = job_ids[i:i + 900]
+            cursor = await db.execute(f"""
+                SELECT job_id, embedding FROM job_embeddings
+                WHERE job_id IN ({",".join("?" for _ in chunk)})
+            """, chunk)
+            for job_id, blob in await cursor.fetchall():
+                embeddings[job_id] = np.frombuffer(blob, dtype=np.float32)
+    return embeddings
+
+
+async def save_job_embeddings(embeddings: Dict[str, np.ndarray]):
+    if not embeddings:
+        return
+    async with aiosqlite.connect(DB_PATH) as db:
+        await db.executemany(
+            "INSERT OR REPLACE INTO job_embeddings (job_id, embedding) VALUES (?, ?)",
+            [(job_id, emb.astype(np.float32).tobytes()) for job_id, emb in embeddings.items()]
+        )
+        await db.commit()
+
+
+async def _apply_feedback(db, chat_id: str, job_id: str, accepted: bool):
+    chat_id, action = str(chat_id), "accept" if accepted else "decline"
+    cursor = await db.execute("SELECT action FROM job_feedback WHERE chat_id = ? AND job_id = ?", (chat_id, job_id))
+    previous = await cursor.fetchone()
+    previous = previous[0] if previous else None
+    if previous == action:
+        # Repeated tap on the same button: nothing new to learn
+        return
+    await db.execute("""
+        INSERT OR REPLACE INTO job_feedback (chat_id, job_id, action) VALUES (?, ?, ?)
+    """, (chat_id, job_id, action))
+
+    cursor = await db.execute("SELECT embedding FROM job_embeddings WHERE job_id = ?", (job_id,))
+    row = await cursor.fetchone()
+    if row:
+        cursor = await db.execute("SELECT weights, bias FROM preferences WHERE chat_id = ?", (chat_id,))
+        pref = await cursor.fetchone()
+        weights = np.frombuffer(pref[0], dtype=np.float32) if pref and pref[0] is not None else None
+        weights, bias = update_preference(weights, pref[1] if pref else 0.0,
+                                          np.frombuffer(row[0], dtype=np.float32), accepted)
+        # A changed mind moves the tap from one counter to the other
+        undo = f", {previous}s = max({previous}s - 1, 0)" if previous else ""
+        await db.execute(f"""
+            INSERT INTO preferences (chat_id, weights, bias, {action}s) VALUES (?, ?, ?, 1)
+            ON CONFLICT(chat_id) DO UPDATE SET
+                weights = excluded.weights, bias = excluded.bias, {action}s = {action}s + 1{undo}
+        """, (chat_id, weights.tobytes(), bias))
+
+
+async def record_feedback(chat_id: str, job_id: str, accepted: bool):
+    """
+    Store an Accept/Decline and take one online-learning step on the chat's
+    preference model. Declines also hide the job from that chat (only).
+    Tapping the same button again is a no-op. Jobs without a stored
+    embedding are recorded but do not train the model.
+    """
+    await record_feedback_batch([(chat_id, job_id, accepted)])
+
+
+async def record_feedback_batch(items: List[tuple]):
+    """record_feedback() for many (chat_id, job_id, accepted) taps in one transaction, in order."""
+    if not items:
+        return
+    async with aiosqlite.connect(DB_PATH) as db:
+        for chat_id, job_id, accepted in items:
+            await _apply_feedback(db, chat_id, job_id, accepted)
+        await db.commit()